@@ -0,0 +1,146 @@
+"""Anytime Repairing A* (ARA*, Likhachev, Gordon and Thrun 2003).
+
+ARA* runs weighted A* with an inflated heuristic, which quickly finds a
+path costing at most weight times the optimal one, then lowers the weight
+and repairs that search instead of starting over. Nodes whose g improved
+after they were expanded are remembered as inconsistent and are the only
+ones expanded again, so every later path reuses the work of the earlier
+ones. Each path comes with the bound it is proven to meet, which reaches
+1.0 once it is optimal.
+
+    for result in arastar_paths(grid, start, end, deadline=0.005):
+        use(result.path)  # cost <= result.bound * optimal cost
+"""
+from itertools import chain
+from time import perf_counter
+
+from algorithms.components import connected
+from algorithms.core import (INF, NULL_OBSERVER, SearchResult, SearchStats, no_path, parent_array, path_cost,
+                             reconstruct_path, score_array)
+from algorithms.openset import HeapOpenSet
+
+
+class AnytimeResult(SearchResult):
+    """SearchResult of one ARA* iteration.
+
+    weight is the heuristic inflation the path was found with and bound the
+    proven suboptimality: cost is at most bound times the optimal cost.
+    bound is never above weight and is often well below it.
+    """
+
+    def __init__(self, path, cost, stats, weight, bound):
+        super().__init__(path, cost, stats)
+        self.weight = weight
+        self.bound = bound
+
+    def __repr__(self):
+        return (f"AnytimeResult(cost={self.cost}, bound={self.bound:.3f}, weight={self.weight}, "
+                f"expanded={self.expanded}, length={len(self.path)})")
+
+
+def arastar_paths(grid, start, end, observer=NULL_OBSERVER, heuristic=None, weight=3.0, decrement=0.5,
+                  deadline=None, budget=None, stats=None):
+    """Yield AnytimeResults for cell indices start and end, each one no worse than the last.
+
+    The first search uses the given weight; every later one lowers it by
+    decrement, or straight to the bound already proven if that is lower,
+    until a path is proven optimal. deadline is a number of seconds from
+    the first next() call and budget a number of expansions over all
+    iterations; when either runs out the generator stops, keeping the last
+    path it yielded as the best one found. heuristic must be consistent,
+    as the default grid.distance is, for the bounds to hold. The running
+    counts go to stats when one is passed; each result gets a copy.
+    """
+    if weight < 1 or decrement <= 0:
+        raise ValueError(f"weight must be at least 1 and decrement positive, got {weight} and {decrement}")
+    stats = stats or SearchStats()
+    if not connected(grid, start, end):
+        return
+    if heuristic is None:
+        heuristic = grid.distance
+    stop_at = None if deadline is None else perf_counter() + deadline
+
+    g_score = score_array(grid.size)
+    g_score[start] = 0
+    came_from = parent_array(grid.size)
+    closed = bytearray(grid.size)
+    inconsistent = set()  # closed nodes whose g has improved since
+    open_set = HeapOpenSet()
+    open_set.push(start, weight * heuristic(start, end))
+    best_path, best_cost = None, INF
+    stats.pushes = 1
+    stats.lap("setup")
+
+    while True:
+        # The goal's h is 0, so its f is g_score[end] at every weight
+        while open_set and open_set.peek()[0] < g_score[end]:
+            if stats.expanded == budget or (stop_at is not None and perf_counter() >= stop_at):
+                return
+            current = open_set.pop()
+            closed[current] = 1
+            stats.expanded += 1
+            observer.on_close(current)
+
+            current_g = g_score[current]
+            for neighbor, step in grid.edges(current):
+                temp_g_score = current_g + step
+                if temp_g_score < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = temp_g_score
+                    if closed[neighbor]:
+                        inconsistent.add(neighbor)
+                        continue
+                    if neighbor not in open_set:
+                        observer.on_open(neighbor)
+                    open_set.push(neighbor, temp_g_score + weight * heuristic(neighbor, end))
+                    stats.pushes += 1
+
+            if len(open_set) > stats.peak_open:
+                stats.peak_open = len(open_set)
+
+        if g_score[end] == INF:
+            return
+        stats.lap("search")
+        indices = reconstruct_path(came_from, end)
+        cost = path_cost(grid, indices)
+        # g_score[end] only falls, but the path traced through the tree can
+        # cost less than it, so a later search may trace a costlier one
+        if cost < best_cost:
+            best_path, best_cost = [grid.pos(index) for index in indices], cost
+        # Every cheaper path still has to pass through an open or
+        # inconsistent node, so the smallest unweighted f among them is a
+        # lower bound on the optimal cost.
+        lower = min((g_score[node] + heuristic(node, end) for node in chain(open_set, inconsistent)), default=INF)
+        bound = 1.0 if lower >= best_cost else min(weight, best_cost / lower) if lower else weight
+        stats.lap("path")
+        yield AnytimeResult(best_path, best_cost, stats.copy(), weight, bound)
+        if bound <= 1:
+            return
+
+        weight = max(1.0, min(weight - decrement, bound))
+        # Requeue the open and inconsistent nodes under the new weight and
+        # start the next search with nothing closed
+        reopened = HeapOpenSet()
+        for node in chain(open_set, inconsistent):
+            reopened.push(node, g_score[node] + weight * heuristic(node, end))
+        stats.pushes += len(reopened)
+        stats.reopens += len(inconsistent)
+        open_set = reopened
+        inconsistent = set()
+        closed = bytearray(grid.size)
+
+
+def arastar_algorithm(grid, start, end, observer=NULL_OBSERVER, heuristic=None, weight=3.0, decrement=0.5,
+                      deadline=None, budget=None):
+    """
+    Anytime Repairing A* (ARA*)
+    Runs arastar_paths and returns its last AnytimeResult: the optimal
+    path when neither deadline nor budget cut it short, otherwise the best
+    path found in time with its bound. No path is returned if they ran
+    out before the first one, with the stats of the work done until then.
+    """
+    stats = SearchStats()
+    result = None
+    for result in arastar_paths(grid, start, end, observer, heuristic, weight, decrement, deadline, budget, stats):
+        pass
+    return result or no_path(stats)
@@ -1,67 +1,63 @@
-from queue import PriorityQueue
-import pygame
-import globals
-
-def h(p1, p2):
-	x1, y1 = p1
-	x2, y2 = p2
-	return abs(x1 - x2) + abs(y1 - y2)
-
-
-def reconstruct_path(came_from, current, draw):
-	while current in came_from:
-		current = came_from[current]
-		current.make_path()
-		draw()
-
-
-# Inside algorithms.py
-def astar_algorithm(draw, grid, start, end): 
-    count = 0
-    count_state = 0
-    globals.state["number_of_node_explored"] = 0
-    open_set = PriorityQueue()
-    open_set.put((0, count, start))
-    came_from = {}
-    g_score = {spot: float("inf") for row in grid for spot in row}
+from algorithms.components import connected
+from algorithms.core import INF, NULL_OBSERVER, SearchStats, make_result, no_path, parent_array, score_array
+from algorithms.openset import HeapOpenSet
+
+
+def astar_algorithm(grid, start, end, observer=NULL_OBSERVER, heuristic=None, queue=None, weight=1):
+    # heuristic(a, b) bounds the cost between two cell indices, by default
+    # grid.distance: Manhattan, or octile on 8-connected grids. Every move costs
+    # at least 1 (sqrt(2) diagonally), so it stays admissible on weighted terrain.
+    # queue is the open set class, see algorithms.openset, HeapOpenSet by
+    # default. Dial's bucket queue also works on 4-connected grids with the
+    # Manhattan heuristic, where f is an integer that never drops, but A*'s
+    # open set stays small and benchmarks/open_sets.py shows no consistent
+    # gain from it.
+    # weight > 1 inflates the heuristic (weighted A*): fewer expansions, and a
+    # path that costs at most weight times the optimal one. f then no longer
+    # rises monotonically, so the default open set is a heap.
+    stats = SearchStats()
+    if not connected(grid, start, end):
+        return no_path(stats)
+    if heuristic is None:
+        heuristic = grid.distance
+    queue = queue or HeapOpenSet
+    if heuristic(start, end) == INF:
+        return no_path(stats)
+
+    open_set = queue()
+    open_set.push(start, weight * heuristic(start, end))
+    came_from = parent_array(grid.size)
+    g_score = score_array(grid.size)
     g_score[start] = 0
-    f_score = {spot: float("inf") for row in grid for spot in row}
-    f_score[start] = h(start.get_pos(), end.get_pos())
+    stats.pushes = 1
+    stats.lap("setup")
 
-    open_set_hash = {start}
+    while open_set:
+        current = open_set.pop()
 
-    while not open_set.empty():
-        yield  # Yield for each loop iteration
+        if current == end:
+            return make_result(grid, came_from, end, stats)
 
-        current = open_set.get()[2]
-        open_set_hash.remove(current)
+        stats.expanded += 1
+        observer.on_close(current)
 
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
-            return
-        
-        count_state += 1
+        current_g = g_score[current]
+        for neighbor, step in grid.edges(current):
+            temp_g_score = current_g + step
 
-        for neighbor in current.neighbors:
-            temp_g_score = g_score[current] + 1
-            
             if temp_g_score < g_score[neighbor]:
+                if neighbor not in open_set:
+                    # Only expanded nodes leave the open set with a finite g
+                    if g_score[neighbor] != INF:
+                        stats.reopens += 1
+                    observer.on_open(neighbor)
                 came_from[neighbor] = current
                 g_score[neighbor] = temp_g_score
-                f_score[neighbor] = temp_g_score + h(neighbor.get_pos(), end.get_pos())
-                if neighbor not in open_set_hash:
-                    count += 1
-                    open_set.put((f_score[neighbor], count, neighbor))
-                    open_set_hash.add(neighbor)
-                    neighbor.make_open()
-                    globals.state["number_of_node_explored"] += 1
+                # For a queued neighbor this lowers its priority (decrease-key)
+                open_set.push(neighbor, temp_g_score + weight * heuristic(neighbor, end))
+                stats.pushes += 1
 
-        draw()
-        print("A* algorithm")
-        print(f"Number of nodes explored: {globals.state["number_of_node_explored"]} at state  {count_state}") 
-        if current != start:
-            current.make_closed()
-    
-    return 
+        if len(open_set) > stats.peak_open:
+            stats.peak_open = len(open_set)
 
+    return no_path(stats)
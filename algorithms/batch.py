@@ -0,0 +1,55 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+from algorithms.grid import Grid
+from algorithms.search import find_path
+
+# Per-worker state, set once by _attach when the pool starts
+_worker = {}
+
+
+def _attach(name, rows, cols, weighted, moves, algorithm, options):
+    memory = shared_memory.SharedMemory(name=name)
+    size = rows * cols
+    _worker["memory"] = memory
+    costs = memory.buf[size:2 * size] if weighted else None
+    _worker["grid"] = Grid(rows, cols, memory.buf[:size], costs, *moves)
+    _worker["algorithm"] = algorithm
+    _worker["options"] = options
+
+
+def _run(task):
+    number, start, end = task
+    result = find_path(_worker["grid"], start, end, _worker["algorithm"], **_worker["options"])
+    return number, result
+
+
+def find_paths(grid, queries, algorithm="astar", processes=None, chunksize=None, **options):
+    """Run many (start, end) queries on one grid across a process pool.
+
+    The barrier bytes, and the cost plane if there is one, are copied once
+    into a shared memory block that every worker maps as its own Grid, so
+    tasks only carry the two positions.
+    Yields (number, SearchResult) pairs in completion order, where number
+    is the query's position in queries. The grid must not change while the
+    generator is running.
+    """
+    queries = list(queries)
+    processes = processes or multiprocessing.cpu_count()
+    if chunksize is None:
+        chunksize = max(1, len(queries) // (processes * 8))
+
+    weighted = grid.costs is not None
+    memory = shared_memory.SharedMemory(create=True, size=max(grid.size * (2 if weighted else 1), 1))
+    try:
+        memory.buf[:grid.size] = grid.cells
+        if weighted:
+            memory.buf[grid.size:2 * grid.size] = grid.costs
+        moves = (grid.connectivity, grid.corners)
+        initargs = (memory.name, grid.rows, grid.cols, weighted, moves, algorithm, options)
+        with multiprocessing.Pool(processes, _attach, initargs) as pool:
+            tasks = ((number, start, end) for number, (start, end) in enumerate(queries))
+            yield from pool.imap_unordered(_run, tasks, chunksize)
+    finally:
+        memory.close()
+        memory.unlink()
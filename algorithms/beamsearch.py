@@ -1,49 +1,76 @@
-from collections import deque
-import pygame
-import globals
+from heapq import nsmallest
 
-def reconstruct_path(came_from, current, draw):
-    while current in came_from:
-        current = came_from[current]
-        current.make_path()
-        draw()
+from algorithms.components import connected
+from algorithms.core import INF, NULL_OBSERVER, SearchStats, make_result, no_path
 
-def beam_search_algorithm(draw, grid, start, end, beam_width=3):
-    
-    queue = deque([start])
-    visited = {start}
-    came_from = {}
-    count_state = 0
+def beam_search_algorithm(grid, start, end, observer=NULL_OBSERVER, beam_width=3, heuristic=None, widen=2,
+                          max_width=None):
+    """
+    Beam Search
+    Level-synchronous: each step expands every cell in the beam and keeps
+    only the beam_width children with the smallest heuristic, cheaper g
+    first on ties, as the next beam. Cells that were in a beam are never
+    entered again, so the search keeps at most beam_width cells per level
+    and its memory grows as beam_width x depth, not with the grid.
+    When the beam dead-ends it restarts from start with the width
+    multiplied by widen, up to max_width (no limit by default); a beam as
+    wide as the grid is a breadth-first search, so a path is always found
+    when one exists. stats.reopens counts the cells a restart puts back
+    in a beam. Not guaranteed to find the optimal path.
+    heuristic(a, b) takes two cell indices, grid.distance by default.
+    """
+    if beam_width < 1 or widen <= 1:
+        raise ValueError(f"beam_width must be at least 1 and widen above 1, got {beam_width} and {widen}")
+    stats = SearchStats()
+    if not connected(grid, start, end):
+        return no_path(stats)
+    if heuristic is None:
+        heuristic = grid.distance
+    if heuristic(start, end) == INF:
+        return no_path(stats)
+    if max_width is None:
+        max_width = grid.size
+    # Cells expanded by earlier, narrower attempts
+    tried = set()
+    stats.lap("setup")
 
-    while queue:
-        yield  # Yield for each loop iteration
+    while True:
+        # Parent of every cell that has been in a beam, doubling as the visited set
+        came_from = {start: -1}
+        g_score = {start: 0}
+        beam = [start]
+        stats.pushes += 1
 
-        current_level = []
-        for _ in range(min(beam_width, len(queue))):
-            current = queue.popleft()
-            current_level.append(current)
+        while beam:
+            # Children not yet in a beam, each with its cheapest g and parent
+            candidates = {}
+            for current in beam:
+                if current == end:
+                    return make_result(grid, came_from, end, stats)
 
-            if current == end:
-                reconstruct_path(came_from, end, draw)
-                end.make_end()
-                return
+                stats.expanded += 1
+                observer.on_close(current)
+                current_g = g_score.pop(current)
+                for neighbor, step in grid.edges(current):
+                    if neighbor in came_from:
+                        continue
+                    g = current_g + step
+                    known = candidates.get(neighbor)
+                    if known is None or g < known[1]:
+                        candidates[neighbor] = (heuristic(neighbor, end), g, current)
 
-            for neighbor in current.neighbors:
-                if neighbor not in visited and not neighbor.is_barrier():
-                    visited.add(neighbor)
-                    came_from[neighbor] = current
-                    neighbor.make_open()
-                    globals.state["number_of_node_explored"] += 1
-                    queue.append(neighbor)
+            if len(candidates) > stats.peak_open:
+                stats.peak_open = len(candidates)
+            beam = nsmallest(beam_width, candidates, key=candidates.__getitem__)
+            for neighbor in beam:
+                _, g_score[neighbor], came_from[neighbor] = candidates[neighbor]
+                stats.pushes += 1
+                if neighbor in tried:
+                    stats.reopens += 1
+                observer.on_open(neighbor)
 
-        count_state += 1
-        draw()
-
-        for node in current_level:
-            if node != start:
-                node.make_closed()
-
-        print("Beam search algorithm")
-        print(f"Number of nodes explored: {globals.state['number_of_node_explored']} at state {count_state}")
-    
-    return
\ No newline at end of file
+        if beam_width >= max_width:
+            return no_path(stats)
+        # Dead end: try again with a wider beam
+        beam_width = min(max(int(beam_width * widen), beam_width + 1), max_width)
+        tried.update(came_from)
@@ -1,104 +1,84 @@
-from collections import deque
-import pygame
-import globals
+from algorithms.components import connected
+from algorithms.core import INF, NULL_OBSERVER, SearchResult, SearchStats, no_path, parent_array, path_cost, reconstruct_path, score_array
+from algorithms.openset import BucketQueue, HeapOpenSet
 
-def reconstruct_path_bidirectional(came_from_start, came_from_end, meeting_point, start, end, draw):
+def reconstruct_path_bidirectional(came_from_start, came_from_end, meeting_point):
     """Reconstruct path from both directions meeting at meeting_point"""
+    path = reconstruct_path(came_from_start, meeting_point)
     current = meeting_point
-    path_start = []
-    while current in came_from_start:
-        current = came_from_start[current]
-        path_start.append(current)
-    
-    path_start.reverse()
-    
-    current = meeting_point
-    path_end = []
-    while current in came_from_end:
+    while came_from_end[current] != -1:
         current = came_from_end[current]
-        path_end.append(current)
-    
-    for spot in path_start:
-        if spot != start:
-            spot.make_path()
-            draw()
-    
-    meeting_point.make_path()
-    draw()
-    
-    for spot in path_end:
-        if spot != end:
-            spot.make_path()
-            draw()
+        path.append(current)
+    return path
+
+def bi_directional_search_algorithm(grid, start, end, observer=NULL_OBSERVER, queue=None):
+    """
+    Bidirectional uniform-cost search
+    Dijkstra runs forwards from start and backwards from end, always
+    expanding the side with the smaller open set. Whenever the two trees
+    touch, the cheapest start-to-end cost through the touching cell is
+    kept; the search stops once the smallest costs on the two open sets
+    add up to at least that, so the path is optimal on weighted terrain too.
+    """
+    stats = SearchStats()
+    if not connected(grid, start, end):
+        return no_path(stats)
+    queue = queue or (BucketQueue if grid.connectivity == 4 else HeapOpenSet)
+    start_open = queue()
+    end_open = queue()
+    start_open.push(start, 0)
+    end_open.push(end, 0)
 
-def bi_directional_search_algorithm(draw, grid, start, end):
-    from queue import Queue
-    
-    globals.state["number_of_node_explored"] = 0
-    
-    start_queue = Queue()
-    end_queue = Queue()
-    start_queue.put(start)
-    end_queue.put(end)
+    # g_start is the cost from start to a cell, g_end the cost from a cell to end
+    g_start = score_array(grid.size)
+    g_end = score_array(grid.size)
+    g_start[start] = 0
+    g_end[end] = 0
+    came_from_start = parent_array(grid.size)
+    came_from_end = parent_array(grid.size)
+    best = 0 if start == end else INF
+    meeting_point = start
+    stats.pushes = 2
+    stats.lap("setup")
 
-    start_visited = {start}
-    end_visited = {end}
-    came_from_start = {}
-    came_from_end = {}
-    count_state = 0
+    while start_open and end_open:
+        if start_open.peek()[0] + end_open.peek()[0] >= best:
+            break
 
-    while not start_queue.empty() and not end_queue.empty():
-        yield  # Yield for visualization
-        
-        if not start_queue.empty():
-            current_start = start_queue.get()
-            
-            if current_start in end_visited:
-                print(f"Bidirectional search: Paths met at {current_start.get_pos()}")
-                reconstruct_path_bidirectional(came_from_start, came_from_end, current_start, start, end, draw)
-                start.make_start()  
-                end.make_end()      
-                return
+        forward = len(start_open) <= len(end_open)
+        if forward:
+            open_set, g, came_from, other_g = start_open, g_start, came_from_start, g_end
+        else:
+            open_set, g, came_from, other_g = end_open, g_end, came_from_end, g_start
+        current = open_set.pop()
+        stats.expanded += 1
+        observer.on_close(current)
 
-            for neighbor in current_start.neighbors:
-                if neighbor not in start_visited and not neighbor.is_barrier():
-                    start_visited.add(neighbor)
-                    came_from_start[neighbor] = current_start
-                    start_queue.put(neighbor)
-                    if neighbor not in end_visited:
-                        neighbor.make_open()  
-                    globals.state["number_of_node_explored"] += 1
-            
-            if current_start != start:
-                current_start.make_closed()
+        current_g = g[current]
+        # Moving into a cell costs that cell's cost, so backwards the step from
+        # a neighbor into current pays for current
+        for neighbor, step in (grid.edges(current) if forward else grid.reverse_edges(current)):
+            temp_g_score = current_g + step
+            if temp_g_score < g[neighbor]:
+                if neighbor not in open_set:
+                    observer.on_open(neighbor)
+                came_from[neighbor] = current
+                g[neighbor] = temp_g_score
+                open_set.push(neighbor, temp_g_score)
+                stats.pushes += 1
+                if temp_g_score + other_g[neighbor] < best:
+                    best = temp_g_score + other_g[neighbor]
+                    meeting_point = neighbor
 
-        if not end_queue.empty():
-            current_end = end_queue.get()
-            
-            if current_end in start_visited:
-                print(f"Bidirectional search: Paths met at {current_end.get_pos()}")
-                reconstruct_path_bidirectional(came_from_start, came_from_end, current_end, start, end, draw)
-                start.make_start()  
-                end.make_end()      
-                return
+        open_size = len(start_open) + len(end_open)
+        if open_size > stats.peak_open:
+            stats.peak_open = open_size
 
-            for neighbor in current_end.neighbors:
-                if neighbor not in end_visited and not neighbor.is_barrier():
-                    end_visited.add(neighbor)
-                    came_from_end[neighbor] = current_end
-                    end_queue.put(neighbor)
-                    if neighbor not in start_visited:
-                        neighbor.make_open()  
-                    globals.state["number_of_node_explored"] += 1
-            
-            if current_end != end:
-                current_end.make_closed()
+    if best == INF:
+        return no_path(stats)
 
-        count_state += 1
-        draw()
-        print("Bi-directional search algorithm")
-        print(f"Number of nodes explored: {globals.state['number_of_node_explored']} at state {count_state}")
-        print(f"Start queue size: {start_queue.qsize()}, End queue size: {end_queue.qsize()}")
-    
-    print("Bidirectional search: No solution found")
-    return
\ No newline at end of file
+    stats.lap("search")
+    indices = reconstruct_path_bidirectional(came_from_start, came_from_end, meeting_point)
+    path = [grid.pos(index) for index in indices]
+    stats.lap("path")
+    return SearchResult(path, path_cost(grid, indices), stats)
@@ -0,0 +1,118 @@
+from algorithms.bi_direction_search import reconstruct_path_bidirectional
+from algorithms.components import connected
+from algorithms.core import INF, NULL_OBSERVER, SearchResult, SearchStats, no_path, parent_array, path_cost, score_array
+from algorithms.openset import HeapOpenSet
+
+# Cheapest single move on any grid: cell costs start at 1 and straight moves pay exactly that
+MIN_MOVE = 1
+
+
+class _Frontier:
+    """One direction of the search: its g values, tree and open sets.
+
+    The open set ranks nodes by MM's priority max(f, 2g), preferring the
+    larger g on ties. by_f and by_g hold the same nodes ranked by f and by
+    g alone, only to read the smallest of each for the stopping rule.
+    """
+
+    def __init__(self, grid, source, target, heuristic, forward):
+        self.target = target
+        self.heuristic = heuristic
+        self.edges = grid.edges if forward else grid.reverse_edges
+        self.g = score_array(grid.size)
+        self.g[source] = 0
+        self.came_from = parent_array(grid.size)
+        self.open_set = HeapOpenSet()
+        self.by_f = HeapOpenSet()
+        self.by_g = HeapOpenSet()
+        self.push(source, 0)
+
+    def push(self, node, g):
+        f = g + self.heuristic(node, self.target)
+        self.open_set.push(node, (max(f, 2 * g), -g))
+        self.by_f.push(node, f)
+        self.by_g.push(node, g)
+
+    def pop(self):
+        node = self.open_set.pop()
+        self.by_f.remove(node)
+        self.by_g.remove(node)
+        return node
+
+    def priority(self):
+        return self.open_set.peek()[0][0] if self.open_set else INF
+
+
+def bidirectional_astar_algorithm(grid, start, end, observer=NULL_OBSERVER, heuristic=None):
+    """
+    Bidirectional A* that meets in the middle (MM, Holte et al. 2016)
+    One A* runs forwards from start towards end and one backwards from end
+    towards start. Each ranks its open nodes by max(f, 2g), so neither side
+    expands a node more than halfway along the optimal path, and the side
+    with the lower priority expands next. Every time the two trees touch,
+    the cheapest joining path is kept. The search stops once that path
+    costs no more than a lower bound on any path not yet seen: the smaller
+    of the two sides' lowest priorities, either side's lowest f, or the
+    two lowest g plus the cheapest move. Optimal with any admissible
+    heuristic, on weighted terrain too.
+    heuristic(a, b) bounds the cost between two cell indices, grid.distance by default.
+    """
+    stats = SearchStats()
+    if not connected(grid, start, end):
+        return no_path(stats)
+    if heuristic is None:
+        heuristic = grid.distance
+
+    forward = _Frontier(grid, start, end, heuristic, True)
+    backward = _Frontier(grid, end, start, heuristic, False)
+    best = 0 if start == end else INF
+    meeting_point = start
+    stats.pushes = 2
+    stats.lap("setup")
+
+    while forward.open_set and backward.open_set:
+        forward_priority = forward.priority()
+        backward_priority = backward.priority()
+        bound = max(min(forward_priority, backward_priority), forward.by_f.peek()[0], backward.by_f.peek()[0],
+                    forward.by_g.peek()[0] + backward.by_g.peek()[0] + MIN_MOVE)
+        if best <= bound:
+            break
+
+        if forward_priority < backward_priority or \
+                (forward_priority == backward_priority and len(forward.open_set) <= len(backward.open_set)):
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+        current = side.pop()
+        stats.expanded += 1
+        observer.on_close(current)
+
+        g = side.g
+        current_g = g[current]
+        for neighbor, step in side.edges(current):
+            temp_g_score = current_g + step
+            if temp_g_score < g[neighbor]:
+                if neighbor not in side.open_set:
+                    if g[neighbor] != INF:
+                        stats.reopens += 1
+                    observer.on_open(neighbor)
+                side.came_from[neighbor] = current
+                g[neighbor] = temp_g_score
+                side.push(neighbor, temp_g_score)
+                stats.pushes += 1
+                if temp_g_score + other.g[neighbor] < best:
+                    best = temp_g_score + other.g[neighbor]
+                    meeting_point = neighbor
+
+        open_size = len(forward.open_set) + len(backward.open_set)
+        if open_size > stats.peak_open:
+            stats.peak_open = open_size
+
+    if best == INF:
+        return no_path(stats)
+
+    stats.lap("search")
+    indices = reconstruct_path_bidirectional(forward.came_from, backward.came_from, meeting_point)
+    path = [grid.pos(index) for index in indices]
+    stats.lap("path")
+    return SearchResult(path, path_cost(grid, indices), stats)
@@ -0,0 +1,116 @@
+import sys
+from collections import OrderedDict
+
+from algorithms.core import SearchResult, SearchStats, path_cost
+from algorithms.search import find_path
+
+# Algorithms whose paths are shortest paths on unit-cost grids. Any suffix
+# of such a path is itself a shortest path to the same goal, so it can be
+# served from the cache without searching.
+OPTIMAL = {"bfs", "bfs_wavefront", "ucs", "astar", "arastar", "jps", "dstar_lite", "flowfield", "bidirectional",
+           "bidirectional_astar"}
+
+# The subset that is still optimal once grid.costs weights the moves
+WEIGHTED_OPTIMAL = {"ucs", "astar", "arastar", "flowfield", "bidirectional", "bidirectional_astar"}
+
+
+def _reuses_suffixes(grid, algorithm, options):
+    return not options and algorithm in (OPTIMAL if grid.costs is None else WEIGHTED_OPTIMAL)
+
+
+def _result_size(result):
+    return sys.getsizeof(result) + sys.getsizeof(result.path) + sum(sys.getsizeof(pos) for pos in result.path)
+
+
+class PathCache:
+    """LRU memo of find_path results.
+
+    Entries are keyed on the map content hash, so an edited grid never hits
+    stale entries while an identical map loaded again still does. The
+    cache is bounded by max_entries and, optionally, by max_bytes of stored
+    paths, evicting the least recently used entry first.
+
+    On a miss, a cached shortest path to the same goal that passes through
+    the requested start is cut down to its suffix instead of searching.
+    Cached results are shared, so treat them as read-only.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (result, size)
+        self.suffixes = {}  # (map hash, algorithm, end) -> {position: (key, offset in path)}
+        self.bytes = 0
+        self.hits = 0
+        self.suffix_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def find_path(self, grid, start, end, algorithm="astar", **options):
+        digest = grid.content_hash()
+        key = (digest, algorithm, start, end, tuple(sorted(options.items())))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        suffixes = _reuses_suffixes(grid, algorithm, options)
+        if suffixes:
+            owner = self.suffixes.get((digest, algorithm, end), {}).get(start)
+            if owner is not None:
+                owner_key, offset = owner
+                self.entries.move_to_end(owner_key)
+                self.suffix_hits += 1
+                suffix = self.entries[owner_key][0].path[offset:]
+                cost = path_cost(grid, [grid.index(pos) for pos in suffix])
+                return SearchResult(suffix, cost, SearchStats())
+
+        self.misses += 1
+        result = find_path(grid, start, end, algorithm, **options)
+        self._store(key, result, suffixes)
+        return result
+
+    def _store(self, key, result, optimal):
+        size = _result_size(result)
+        self.entries[key] = (result, size)
+        self.bytes += size
+        if optimal and result.found:
+            digest, algorithm, _, end, _ = key
+            index = self.suffixes.setdefault((digest, algorithm, end), {})
+            for offset, pos in enumerate(result.path[:-1]):
+                index[pos] = (key, offset)
+        while self.entries and (len(self.entries) > self.max_entries
+                                or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            self._evict()
+
+    def _evict(self):
+        key, (result, size) = self.entries.popitem(last=False)
+        self.bytes -= size
+        self.evictions += 1
+        digest, algorithm, _, end, _ = key
+        index = self.suffixes.get((digest, algorithm, end))
+        if index is None:
+            return
+        for pos in result.path:
+            if index.get(pos, (None,))[0] == key:
+                del index[pos]
+        if not index:
+            del self.suffixes[(digest, algorithm, end)]
+
+    def clear(self):
+        self.entries.clear()
+        self.suffixes.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.suffix_hits + self.misses
+        return {
+            "hits": self.hits,
+            "suffix_hits": self.suffix_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.suffix_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+        }
@@ -0,0 +1,145 @@
+import re
+from array import array
+
+# Runs of free cells within one row of the barrier plane
+_FREE_RUN = re.compile(rb"\x00+")
+
+
+class Components:
+    """Connected-component label of every free cell, for O(1) reachability.
+
+    labels[index] is 0 on barriers; two free cells are connected exactly
+    when their labels have the same union-find root. The labels are built
+    row by row from runs of free cells, joining runs that touch the run
+    above them, so the Python work is per run rather than per cell.
+
+    The index listens to the grid. Freeing a cell unions the components
+    around it. Blocking one can only split a component if the free cells
+    around it stop being joined inside its 3x3 block; in that case the
+    labels are dropped and rebuilt on the next query. Call notify_changed
+    yourself after writing grid.cells directly.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.labels = None
+        self.parent = []
+        grid.listeners.append(self.notify_changed)
+
+    def _find(self, label):
+        parent = self.parent
+        root = label
+        while parent[root] != root:
+            root = parent[root]
+        while parent[label] != root:
+            parent[label], label = root, parent[label]
+        return root
+
+    def _build(self):
+        grid = self.grid
+        cols = grid.cols
+        cells = bytes(grid.cells)
+        # Under every corner policy but "always", a diagonal move can be
+        # replaced by two straight ones, so components are the 4-connected
+        # ones; with "always", runs touching only at a corner join as well.
+        touch = 1 if grid.connectivity == 8 and grid.corners == "always" else 0
+        self.parent = parent = [0]
+        find = self._find
+        finditer = _FREE_RUN.finditer
+        rows = []
+        previous = []  # (start, stop) spans of the row above and their labels
+        previous_labels = []
+        for row in range(grid.rows):
+            spans = [match.span() for match in finditer(cells[row * cols:(row + 1) * cols])]
+            labels = []
+            count = len(previous)
+            i = 0
+            for start, stop in spans:
+                # Skip runs above that end before this one can touch them
+                while i < count and previous[i][1] + touch <= start:
+                    i += 1
+                label = 0
+                k = i
+                while k < count and previous[k][0] < stop + touch:
+                    above = previous_labels[k]
+                    while parent[above] != above:
+                        above = parent[above]
+                    if not label:
+                        label = above
+                    elif above != label:
+                        parent[above] = label
+                    k += 1
+                if not label:
+                    label = len(parent)
+                    parent.append(label)
+                labels.append(label)
+            rows.append((spans, labels))
+            previous = spans
+            previous_labels = labels
+
+        plane = []
+        for spans, labels in rows:
+            end = 0
+            for (start, stop), label in zip(spans, labels):
+                plane.append(bytes(4 * (start - end)))
+                plane.append(find(label).to_bytes(4, "little") * (stop - start))
+                end = stop
+            plane.append(bytes(4 * (cols - end)))
+        self.labels = array("i", b"".join(plane))
+
+    def _joined_locally(self, index):
+        # Are the free cells next to index, now a barrier, still joined
+        # through the rest of its 3x3 block?
+        grid = self.grid
+        around = grid.neighbors(index)
+        if len(around) < 2:
+            return True
+        row, col = divmod(index, grid.cols)
+        seen = {around[0]}
+        stack = [around[0]]
+        while stack:
+            for neighbor in grid.neighbors(stack.pop()):
+                r, c = divmod(neighbor, grid.cols)
+                if neighbor not in seen and abs(r - row) <= 1 and abs(c - col) <= 1:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return all(cell in seen for cell in around)
+
+    def notify_changed(self, cells):
+        for index in cells:
+            labels = self.labels
+            if labels is None:
+                return
+            if self.grid.cells[index]:
+                if labels[index]:
+                    labels[index] = 0
+                    if not self._joined_locally(index):
+                        self.labels = None
+            elif not labels[index]:
+                self.parent.append(len(self.parent))
+                root = len(self.parent) - 1
+                for neighbor in self.grid.neighbors(index):
+                    self.parent[self._find(labels[neighbor])] = root
+                labels[index] = root
+
+    def connected(self, a, b):
+        """True if a path of free cells joins cell indices a and b"""
+        if self.labels is None:
+            self._build()
+        labels = self.labels
+        if not labels[a] or not labels[b]:
+            return False
+        return labels[a] == labels[b] or self._find(labels[a]) == self._find(labels[b])
+
+
+def components_for(grid):
+    """The Components index of grid, kept in grid.cache"""
+    index = grid.cache.get("components")
+    if index is None:
+        index = grid.cache["components"] = Components(grid)
+    return index
+
+
+def connected(grid, a, b):
+    """True if cell indices a and b can be joined by a path on grid"""
+    return components_for(grid).connected(a, b)
@@ -0,0 +1,329 @@
+"""Cooperative pathfinding for many agents (CA* and windowed HCA*, Silver 2005).
+
+Agents are planned one after another with A* over (cell, tick) states,
+where every tick an agent either moves to a neighbor or waits in place.
+Each planned path is written to a shared ReservationTable, and the agents
+planned after it avoid those cells at those ticks. They also avoid swapping
+places with an agent along an edge. The heuristic is the true cost to
+the goal, read from the goal's FlowField, which a reverse search builds
+once per goal and every agent heading there shares.
+
+Without a window (cooperative A*), every agent plans its whole route and
+then stays parked on its goal. With a window (WHCA*), agents only reserve
+the next window ticks, beyond which the heuristic alone guides them, and
+replan as the clock advances, so an agent that has arrived still steps
+aside for the others:
+
+    paths = cooperative_paths(grid, [(start, goal), ...], window=16)
+"""
+from collections import deque
+
+from algorithms.components import connected
+from algorithms.core import INF, SearchResult, SearchStats, no_path
+from algorithms.flowfield import flow_fields
+from algorithms.openset import HeapOpenSet
+
+
+class ReservationTable:
+    """Cells and moves claimed by agents, indexed by tick.
+
+    Tick t from base on has one dict of reserved cells (cell index ->
+    agent) and one of reserved moves (from * size + to -> agent, for the
+    move from t to t + 1), so a lookup is one index and one dict probe
+    and only claimed cells take space. expire() drops the ticks that have
+    passed. A parked agent, on its goal or at the end of its window,
+    holds that cell for every tick from its arrival on, kept apart in
+    parked.
+    """
+
+    def __init__(self, grid, now=0):
+        self.size = grid.size
+        self.base = now
+        self.cells = deque()  # tick - base -> {cell: agent}
+        self.moves = deque()  # tick - base -> {from * size + to: agent}
+        self.parked = {}  # cell -> (first tick, agent)
+        self.plans = {}  # agent -> (first tick, cells, parked)
+
+    @property
+    def horizon(self):
+        """Last tick with a reserved cell or move; later ticks only see parked agents"""
+        return self.base + len(self.cells) - 1
+
+    def __len__(self):
+        return sum(len(cells) for cells in self.cells) + sum(len(moves) for moves in self.moves) + len(self.parked)
+
+    def is_free(self, cell, tick, agent=None):
+        """Whether cell is free for agent at tick"""
+        offset = tick - self.base
+        if 0 <= offset < len(self.cells) and self.cells[offset].get(cell, agent) != agent:
+            return False
+        parked = self.parked.get(cell)
+        return parked is None or parked[1] == agent or tick < parked[0]
+
+    def busy_until(self, cell, agent=None):
+        """Last tick another agent holds cell, INF if one parks there, -1 if none does"""
+        parked = self.parked.get(cell)
+        if parked is not None and parked[1] != agent:
+            return INF
+        for offset in range(len(self.cells) - 1, -1, -1):
+            if self.cells[offset].get(cell, agent) != agent:
+                return self.base + offset
+        return -1
+
+    def reserve(self, agent, cells, tick, park=False):
+        """Claim the cell of each tick from tick on, and the moves between them.
+
+        With park the agent keeps the last cell for good. Whatever agent
+        had reserved before is released first.
+        """
+        self.release(agent)
+        size = self.size
+        while self.base + len(self.cells) < tick + len(cells):
+            self.cells.append({})
+            self.moves.append({})
+        for i, cell in enumerate(cells):
+            offset = tick + i - self.base
+            if offset < 0:
+                continue
+            self.cells[offset][cell] = agent
+            if i + 1 < len(cells) and cells[i + 1] != cell:
+                self.moves[offset][cell * size + cells[i + 1]] = agent
+        if park:
+            self.parked[cells[-1]] = (tick + len(cells) - 1, agent)
+        self.plans[agent] = (tick, cells, park)
+
+    def release(self, agent):
+        """Drop every reservation agent still holds"""
+        plan = self.plans.pop(agent, None)
+        if plan is None:
+            return
+        tick, cells, park = plan
+        size = self.size
+        for i, cell in enumerate(cells):
+            offset = tick + i - self.base
+            if not 0 <= offset < len(self.cells):
+                continue
+            if self.cells[offset].get(cell) == agent:
+                del self.cells[offset][cell]
+            if i + 1 < len(cells) and self.moves[offset].get(cell * size + cells[i + 1]) == agent:
+                del self.moves[offset][cell * size + cells[i + 1]]
+        if park and self.parked.get(cells[-1], (None, None))[1] == agent:
+            del self.parked[cells[-1]]
+
+    def expire(self, now):
+        """Forget the ticks before now"""
+        while self.base < now and self.cells:
+            self.cells.popleft()
+            self.moves.popleft()
+            self.base += 1
+        self.base = max(self.base, now)
+
+    def clear(self):
+        self.cells.clear()
+        self.moves.clear()
+        self.parked.clear()
+        self.plans.clear()
+
+
+class CooperativePlanner:
+    """Plans agents one at a time against a shared ReservationTable.
+
+    window is None for cooperative A*: plan() returns the whole route and
+    parks the agent on its goal. Otherwise plan() returns window ticks of
+    moves, found by A* that stops at tick now + window and ranks those
+    states by the cost so far plus the true cost left, and parks the agent
+    on its last cell until it plans again. Either way a route only ends
+    on a cell no other agent needs later. Waiting costs
+    wait_cost per tick, or nothing on the agent's own goal within a window.
+    Agents are any hashable ids; positions are (row, col) tuples.
+
+    The heuristics come from the grid's FlowFields. Unless max_fields caps
+    them, the cache grows to hold a field for every goal planned for, so
+    agents replanning each round never rebuild an evicted one.
+    """
+
+    def __init__(self, grid, window=None, wait_cost=1, max_fields=None):
+        if window is not None and window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+        self.grid = grid
+        self.window = window
+        self.wait_cost = wait_cost
+        self.table = ReservationTable(grid)
+        self.fields = flow_fields(grid, max_fields)
+        self.max_fields = max_fields
+        self.goals = set()
+
+    def heuristic(self, goal):
+        """True cost to goal from every cell, INF where it cannot be reached"""
+        if goal not in self.goals:
+            self.goals.add(goal)
+            if self.max_fields is None and len(self.goals) > self.fields.max_fields:
+                self.fields.max_fields = len(self.goals)
+        return self.fields.field(goal).cost
+
+    def plan(self, agent, start, goal, now=0):
+        """SearchResult with agent's position at every tick from now, reserving it.
+
+        With no path and no window the agent is parked where it is. With a
+        window its earlier reservations are kept instead, and it should
+        go on following them; every agent planned since has avoided them.
+        """
+        grid = self.grid
+        start, goal = grid.index(start), grid.index(goal)
+        stats = SearchStats()
+        cells = None
+        if connected(grid, start, goal):
+            stats.lap("setup")
+            cells, cost = self._search(agent, start, goal, now, stats)
+        if cells is None:
+            if self.window is None:
+                self.table.reserve(agent, [start], now, park=True)
+            return no_path(stats)
+        self.table.reserve(agent, cells, now, park=True)
+        stats.lap("search")
+        result = SearchResult([grid.pos(index) for index in cells], cost, stats)
+        stats.lap("path")
+        return result
+
+    def _search(self, agent, start, goal, now, stats):
+        grid = self.grid
+        size = grid.size
+        table = self.table
+        reserved, moves, parked = table.cells, table.moves, table.parked
+        base = table.base
+        h = self.heuristic(goal)
+        if h[start] == INF:
+            return None, INF
+        window = self.window
+        if window is None:
+            # Past the horizon every tick looks the same, so states there
+            # share the tick horizon + 1 and the search space stays finite
+            last = max(table.horizon, now) + 1
+        else:
+            last = now + window
+        busy = {}  # cell -> last tick another agent holds it
+        if window is None:
+            busy[goal] = table.busy_until(goal, agent)
+            if busy[goal] == INF:
+                return None, INF  # another agent is parked on the goal
+        wait_cost = self.wait_cost
+
+        # States are (tick - now) * size + cell
+        g_score = {start: 0}
+        came_from = {start: -1}
+        open_set = HeapOpenSet()
+        open_set.push(start, (h[start], 0))
+        stats.pushes = 1
+
+        while open_set:
+            state = open_set.pop()
+            elapsed, current = divmod(state, size)
+            tick = now + elapsed
+            if window is None and current == goal or window is not None and tick == last:
+                if current not in busy:
+                    busy[current] = table.busy_until(current, agent)
+                if tick > busy[current]:
+                    cost = g_score[state]
+                    path = []
+                    while state != -1:
+                        path.append(state % size)
+                        state = came_from[state]
+                    path.reverse()
+                    return path, cost
+                if window is not None:
+                    continue
+            stats.expanded += 1
+
+            current_g = g_score[state]
+            next_tick = tick + 1 if tick < last else tick
+            offset = next_tick - base
+            cells_then = reserved[offset] if 0 <= offset < len(reserved) else None
+            moves_now = moves[tick - base] if 0 <= tick - base < len(moves) else None
+            wait = 0 if window is not None and current == goal else wait_cost
+            options = grid.edges(current)
+            if next_tick != tick:
+                options.append((current, wait))
+            for neighbor, step in options:
+                if cells_then is not None and cells_then.get(neighbor, agent) != agent:
+                    continue
+                hold = parked.get(neighbor)
+                if hold is not None and hold[1] != agent and next_tick >= hold[0]:
+                    continue
+                # Nobody may come the other way along the same edge
+                if moves_now is not None and neighbor != current and \
+                        moves_now.get(neighbor * size + current, agent) != agent:
+                    continue
+                key = (next_tick - now) * size + neighbor
+                new_g = current_g + step
+                if new_g < g_score.get(key, INF):
+                    g_score[key] = new_g
+                    came_from[key] = state
+                    open_set.push(key, (new_g + h[neighbor], now - next_tick))
+                    stats.pushes += 1
+
+            if len(open_set) > stats.peak_open:
+                stats.peak_open = len(open_set)
+
+        return None, INF
+
+
+def cooperative_paths(grid, agents, window=None, wait_cost=1, max_ticks=None, max_fields=None):
+    """Collision-free paths for a list of (start, goal) position pairs.
+
+    Agents are planned in list order, so earlier ones get the better
+    routes, and until its turn every agent holds its start cell. An agent
+    that finds no path stays there, and no other agent runs into it. Each
+    SearchResult lists the agent's position at every tick from 0 until it
+    reaches its goal, waits included. Without a window the agents run
+    cooperative A* once. With one, all of them replan every window // 2
+    ticks until they all stand on their goals, nobody moves for a whole
+    round or max_ticks pass (by default twice the longest true cost plus
+    four windows). An agent left short of its goal then gets the moves it
+    made, with cost INF. max_fields is passed on to CooperativePlanner.
+    """
+    planner = CooperativePlanner(grid, window, wait_cost, max_fields)
+    for agent, (start, _) in enumerate(agents):
+        planner.table.reserve(agent, [grid.index(start)], 0, park=True)
+    if window is None:
+        return [planner.plan(agent, start, goal) for agent, (start, goal) in enumerate(agents)]
+
+    if max_ticks is None:
+        costs = [planner.heuristic(grid.index(goal))[grid.index(start)] for start, goal in agents]
+        max_ticks = int(2 * max([cost for cost in costs if cost != INF], default=0)) + 4 * window
+    step = max(window // 2, 1)
+    trails = [[start] for start, _ in agents]
+    stats = [SearchStats() for _ in agents]
+    now = 0
+    moved = True
+    while moved and now < max_ticks and any(trail[-1] != goal for trail, (_, goal) in zip(trails, agents)):
+        moved = False
+        for agent, (trail, (_, goal)) in enumerate(zip(trails, agents)):
+            result = planner.plan(agent, trail[-1], goal, now)
+            stats[agent].expanded += result.stats.expanded
+            stats[agent].pushes += result.stats.pushes
+            stats[agent].peak_open = max(stats[agent].peak_open, result.stats.peak_open)
+            if result.found:
+                moves = result.path[1:step + 1]
+            else:
+                # Stuck: keep to the moves reserved earlier, which the others avoid
+                tick, cells, _ = planner.table.plans[agent]
+                moves = [grid.pos(index) for index in cells[now - tick + 1:now - tick + 1 + step]]
+                moves += [moves[-1] if moves else trail[-1]] * (step - len(moves))
+            moved = moved or any(pos != trail[-1] for pos in moves)
+            trail.extend(moves)
+        now += step
+        planner.table.expire(now)
+
+    results = []
+    for trail, (_, goal), agent_stats in zip(trails, agents, stats):
+        # Waiting on the goal after the last arrival is not part of the path
+        while len(trail) > 1 and trail[-1] == goal and trail[-2] == goal:
+            trail.pop()
+        cost = 0
+        for a, b in zip(trail, trail[1:]):
+            cost += wait_cost if a == b else grid.move_cost(grid.index(a), grid.index(b))
+        if trail[-1] != goal:
+            cost = INF
+        agent_stats.lap("search")
+        results.append(SearchResult(trail, cost, agent_stats))
+    return results
@@ -0,0 +1,136 @@
+from array import array
+from time import perf_counter
+
+INF = float("inf")
+
+
+class SearchStats:
+    """Counters and timings of one search.
+
+    expanded counts the nodes expanded, pushes the entries added to the
+    open set, reopens the pushes of a node that had been expanded before
+    and peak_open the largest open set seen. phases maps a phase name to
+    the seconds spent in it, see lap().
+    """
+
+    __slots__ = ("expanded", "pushes", "reopens", "peak_open", "phases", "_mark")
+
+    def __init__(self):
+        self.expanded = 0
+        self.pushes = 0
+        self.reopens = 0
+        self.peak_open = 0
+        self.phases = {}
+        self._mark = perf_counter()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap, or since creation, to phase"""
+        now = perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._mark
+        self._mark = now
+
+    def copy(self):
+        """Independent snapshot of the counters and timings so far"""
+        other = SearchStats()
+        other.expanded = self.expanded
+        other.pushes = self.pushes
+        other.reopens = self.reopens
+        other.peak_open = self.peak_open
+        other.phases = dict(self.phases)
+        other._mark = self._mark
+        return other
+
+    def as_dict(self):
+        return {
+            "expanded": self.expanded,
+            "pushes": self.pushes,
+            "reopens": self.reopens,
+            "peak_open": self.peak_open,
+            "phases": dict(self.phases),
+        }
+
+    def __repr__(self):
+        return (f"SearchStats(expanded={self.expanded}, pushes={self.pushes}, reopens={self.reopens}, "
+                f"peak_open={self.peak_open})")
+
+
+class SearchResult:
+    """Outcome of a headless search.
+
+    path is the list of (row, col) positions from start to end inclusive,
+    empty when no path was found, and cost is the number of moves along
+    it. stats holds the SearchStats of the search that produced it.
+    """
+
+    def __init__(self, path, cost, stats):
+        self.path = path
+        self.cost = cost
+        self.stats = stats
+
+    @property
+    def found(self):
+        return bool(self.path)
+
+    @property
+    def expanded(self):
+        return self.stats.expanded
+
+    def __repr__(self):
+        return f"SearchResult(cost={self.cost}, expanded={self.expanded}, length={len(self.path)})"
+
+
+class Observer:
+    """No-op search observer; subclass it to watch a search progress.
+
+    Both hooks receive flat cell indices, see Grid.pos to map them back.
+    """
+
+    def on_open(self, index):
+        pass
+
+    def on_close(self, index):
+        pass
+
+
+NULL_OBSERVER = Observer()
+
+
+def score_array(size):
+    return array("d", [INF]) * size
+
+
+def parent_array(size):
+    return array("i", [-1]) * size
+
+
+def reconstruct_path(parent, current):
+    path = [current]
+    while parent[current] != -1:
+        current = parent[current]
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def path_cost(grid, indices):
+    """Cost of a path of cell indices, every step paying for the cell it enters"""
+    if grid.connectivity == 8:
+        return sum(grid.move_cost(a, b) for a, b in zip(indices, indices[1:]))
+    costs = grid.costs
+    if costs is None:
+        return len(indices) - 1
+    return sum(costs[index] for index in indices) - costs[indices[0]]
+
+
+def make_result(grid, parent, end, stats):
+    stats.lap("search")
+    indices = reconstruct_path(parent, end)
+    path = [grid.pos(index) for index in indices]
+    cost = path_cost(grid, indices)
+    stats.lap("path")
+    return SearchResult(path, cost, stats)
+
+
+def no_path(stats):
+    stats.lap("search")
+    return SearchResult([], INF, stats)
@@ -1,44 +1,35 @@
-from collections import deque
-import pygame
-import globals
+from algorithms.components import connected
+from algorithms.core import NULL_OBSERVER, SearchStats, make_result, no_path, parent_array
 
-def reconstruct_path(came_from, current, draw):
-    while current in came_from:
-        current = came_from[current]
-        current.make_path()
-        draw()
-
-def dfs_algorithm(draw, grid, start, end):
+def dfs_algorithm(grid, start, end, observer=NULL_OBSERVER):
+    stats = SearchStats()
+    if not connected(grid, start, end):
+        return no_path(stats)
     stack = [start]
-    visited = {start}
-    came_from = {}
-    count_state = 0
+    visited = bytearray(grid.size)
+    visited[start] = 1
+    came_from = parent_array(grid.size)
+    stats.pushes = 1
+    stats.lap("setup")
 
     while stack:
-        yield  # Yield for each loop iteration
-
         current = stack.pop()
 
         if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
-            return
+            return make_result(grid, came_from, end, stats)
+
+        stats.expanded += 1
+        observer.on_close(current)
 
-        for neighbor in current.neighbors:
-            if neighbor not in visited and not neighbor.is_barrier():
-                visited.add(neighbor)
+        for neighbor in grid.neighbors(current):
+            if not visited[neighbor]:
+                visited[neighbor] = 1
                 came_from[neighbor] = current
                 stack.append(neighbor)
-                neighbor.make_open()
-                globals.state["number_of_node_explored"] += 1
-
-        count_state += 1
-        draw()
-        print("Depth-first search algorithm")
-        print(f"Number of nodes explored: {globals.state["number_of_node_explored"]} at state  {count_state}") 
-
-        if current != start:
-            current.make_closed()
+                stats.pushes += 1
+                observer.on_open(neighbor)
 
+        if len(stack) > stats.peak_open:
+            stats.peak_open = len(stack)
 
-    return
\ No newline at end of file
+    return no_path(stats)
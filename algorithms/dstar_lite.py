@@ -0,0 +1,175 @@
+from algorithms.components import connected
+from algorithms.core import INF, NULL_OBSERVER, SearchResult, SearchStats, no_path, path_cost, score_array
+from algorithms.openset import HeapOpenSet
+
+
+def h(p1, p2):
+    x1, y1 = p1
+    x2, y2 = p2
+    return abs(x1 - x2) + abs(y1 - y2)
+
+
+class DStarLite:
+    """D* Lite planner that keeps its search tree between queries.
+
+    The search runs backwards from the goal, so g holds the distance of a
+    cell to the goal. When cells flip between free and blocked,
+    notify_changed only re-queues the cells around them and the next plan()
+    repairs the part of the tree that is actually affected. The start may
+    move between plans with move_start, as an agent walking the path would.
+
+    The planner subscribes to grid.listeners, so set_barrier calls reach it
+    automatically; call notify_changed yourself after writing grid.cells
+    directly, and detach() before dropping the planner.
+    """
+
+    def __init__(self, grid, start, goal):
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.last = start
+        self.km = 0
+        self.g = score_array(grid.size)
+        self.rhs = score_array(grid.size)
+        self.rhs[goal] = 0
+        self.open_set = HeapOpenSet()
+        self._push(goal)
+        grid.listeners.append(self.notify_changed)
+
+    def detach(self):
+        self.grid.listeners.remove(self.notify_changed)
+
+    def _adjacent(self, index):
+        # All in-bounds 4-neighbors, blocked or not
+        grid = self.grid
+        row, col = divmod(index, grid.cols)
+        if row < grid.rows - 1:
+            yield index + grid.cols
+        if row > 0:
+            yield index - grid.cols
+        if col < grid.cols - 1:
+            yield index + 1
+        if col > 0:
+            yield index - 1
+
+    def _key(self, index):
+        best = min(self.g[index], self.rhs[index])
+        return best + h(self.grid.pos(self.start), self.grid.pos(index)) + self.km, best
+
+    def _push(self, index):
+        self.open_set.push(index, self._key(index))
+
+    def _update_rhs(self, index):
+        if index == self.goal:
+            return
+        cells = self.grid.cells
+        best = INF
+        if not cells[index]:
+            for neighbor in self._adjacent(index):
+                if not cells[neighbor] and self.g[neighbor] + 1 < best:
+                    best = self.g[neighbor] + 1
+        self.rhs[index] = best
+
+    def _update_vertex(self, index, observer=NULL_OBSERVER):
+        if self.g[index] != self.rhs[index]:
+            if index not in self.open_set:
+                observer.on_open(index)
+            self._push(index)
+        else:
+            self.open_set.remove(index)
+
+    def notify_changed(self, cells):
+        """Tell the planner that these cells flipped between free and blocked"""
+        for index in cells:
+            self._update_rhs(index)
+            self._update_vertex(index)
+            for neighbor in self._adjacent(index):
+                self._update_rhs(neighbor)
+                self._update_vertex(neighbor)
+
+    def move_start(self, start):
+        if start != self.start:
+            self.km += h(self.grid.pos(self.last), self.grid.pos(start))
+            self.last = start
+            self.start = start
+
+    def compute_shortest_path(self, observer=NULL_OBSERVER, stats=None):
+        stats = stats or SearchStats()
+        open_set = self.open_set
+        pushed_before = open_set.count
+        g = self.g
+        rhs = self.rhs
+        start = self.start
+        while True:
+            key, index = open_set.peek()
+            if index is None or (key >= self._key(start) and rhs[start] == g[start]):
+                stats.pushes += open_set.count - pushed_before
+                return stats
+            new_key = self._key(index)
+            if key < new_key:
+                self._push(index)
+                continue
+
+            open_set.pop()
+            stats.expanded += 1
+            observer.on_close(index)
+            if g[index] > rhs[index]:
+                g[index] = rhs[index]
+                for neighbor in self._adjacent(index):
+                    self._update_rhs(neighbor)
+                    self._update_vertex(neighbor, observer)
+            else:
+                # Underconsistent: the cell goes back on the open set to be expanded again
+                stats.reopens += 1
+                g[index] = INF
+                self._update_rhs(index)
+                self._update_vertex(index, observer)
+                for neighbor in self._adjacent(index):
+                    self._update_rhs(neighbor)
+                    self._update_vertex(neighbor, observer)
+            if len(open_set) > stats.peak_open:
+                stats.peak_open = len(open_set)
+
+    def plan(self, observer=NULL_OBSERVER):
+        """Repair the search tree and return the current path from start to goal"""
+        stats = self.compute_shortest_path(observer)
+        grid = self.grid
+        if self.g[self.start] == INF or grid.cells[self.start] or grid.cells[self.goal]:
+            return no_path(stats)
+
+        stats.lap("search")
+        path = [self.start]
+        current = self.start
+        while current != self.goal:
+            current = min(
+                (n for n in self._adjacent(current) if not grid.cells[n]),
+                key=lambda n: self.g[n],
+            )
+            path.append(current)
+        cost = path_cost(grid, path)
+        path = [grid.pos(index) for index in path]
+        stats.lap("path")
+        return SearchResult(path, cost, stats)
+
+
+def dstar_lite_algorithm(grid, start, end, observer=NULL_OBSERVER):
+    """
+    D* Lite (incremental A*)
+    One planner per grid is kept in grid.cache and reused while the goal
+    stays the same, so repeated queries after barrier edits only repair the
+    search tree instead of starting over.
+    """
+    if grid.connectivity != 4:
+        raise ValueError("D* Lite only supports 4-connected grids")
+    if grid.costs is not None:
+        raise ValueError("D* Lite only supports uniform-cost grids")
+    if not connected(grid, start, end):
+        return no_path(SearchStats())
+    planner = grid.cache.get("dstar_lite")
+    if planner is None or planner.goal != end:
+        if planner is not None:
+            planner.detach()
+        planner = grid.cache["dstar_lite"] = DStarLite(grid, start, end)
+    else:
+        planner.move_start(start)
+    return planner.plan(observer)
@@ -0,0 +1,269 @@
+"""Flow fields: one search per goal, shared by every agent heading there.
+
+A FlowField runs Dijkstra backwards from its goal once. That gives the
+integration field, the cheapest cost from every cell to the goal, and
+the direction field, the neighbor to step to next. After that any agent
+reads its next move in O(1), however many agents share the goal:
+
+    fields = flow_fields(grid)
+    step = fields.next_step(agent_pos, goal)  # None at the goal or when cut off
+
+Like the HPA* graph, a field listens to the grid. A barrier or cost edit
+only marks the cell, and the next query repairs the part of the field
+that depended on it instead of searching again. FlowFields keeps one
+field per goal and evicts the least recently used one beyond max_fields.
+"""
+from collections import OrderedDict
+
+from algorithms.components import connected
+from algorithms.core import INF, NULL_OBSERVER, SearchResult, SearchStats, no_path, parent_array, path_cost, score_array
+from algorithms.openset import BucketQueue, HeapOpenSet
+
+# Fields kept per grid by default. Each costs 12 bytes per cell.
+DEFAULT_MAX_FIELDS = 16
+
+
+class FlowField:
+    """Integration and direction fields of one goal cell on a Grid.
+
+    cost[index] is the cheapest cost of moving from the cell to the goal,
+    INF on barriers and cells cut off from it, and toward[index] is the
+    neighbor that path steps to first, -1 at the goal and wherever cost is
+    INF. Both are kept current lazily: edits reported to notify_changed
+    are repaired by update(), which every query calls first.
+
+    The build and each update() add their work to the SearchStats passed
+    in. stats belongs to the field and gets the work no caller was
+    charged for, such as the repairs that next_index, cost_to_goal and
+    path run on their own.
+
+    A repair resets the cells whose step toward the goal went through an
+    edited cell, or used a move the edit took away, together with all the
+    cells upstream of them. Those cells and the edited cells' neighbors
+    then restart Dijkstra from the values around them, which also carries
+    any improvement, such as a freed cell, as far as it reaches.
+    """
+
+    def __init__(self, grid, goal, observer=NULL_OBSERVER, stats=None):
+        self.grid = grid
+        self.goal = goal
+        self.cost = score_array(grid.size)
+        self.toward = parent_array(grid.size)
+        self.dirty = set()
+        self.repairs = 0
+        self.stats = SearchStats()
+        if not grid.cells[goal]:
+            self.cost[goal] = 0
+            self._propagate([goal], observer, stats or self.stats)
+        grid.listeners.append(self.notify_changed)
+
+    def detach(self):
+        self.grid.listeners.remove(self.notify_changed)
+
+    def notify_changed(self, cells):
+        self.dirty.update(cells)
+
+    def _block(self, index):
+        # The cell and its in-bounds neighbors, diagonal ones included
+        cols = self.grid.cols
+        row, col = divmod(index, cols)
+        return [r * cols + c
+                for r in range(max(row - 1, 0), min(row + 2, self.grid.rows))
+                for c in range(max(col - 1, 0), min(col + 2, cols))]
+
+    def _propagate(self, seeds, observer, stats):
+        # Dijkstra backwards from cells whose cost is already set: each
+        # popped cell offers its cost plus the move into it to the cells
+        # that can step to it
+        grid = self.grid
+        cost = self.cost
+        toward = self.toward
+        open_set = BucketQueue() if grid.connectivity == 4 else HeapOpenSet()
+        for index in seeds:
+            open_set.push(index, cost[index])
+        stats.pushes += len(seeds)
+        while open_set:
+            current = open_set.pop()
+            stats.expanded += 1
+            observer.on_close(current)
+            current_cost = cost[current]
+            for neighbor, step in grid.reverse_edges(current):
+                new_cost = current_cost + step
+                if new_cost < cost[neighbor]:
+                    if neighbor not in open_set:
+                        observer.on_open(neighbor)
+                    cost[neighbor] = new_cost
+                    toward[neighbor] = current
+                    open_set.push(neighbor, new_cost)
+                    stats.pushes += 1
+            if len(open_set) > stats.peak_open:
+                stats.peak_open = len(open_set)
+
+    def update(self, observer=NULL_OBSERVER, stats=None):
+        """Repair the field after the edits reported since the last query"""
+        if not self.dirty:
+            return
+        stats = stats or self.stats
+        grid = self.grid
+        cells = grid.cells
+        cost = self.cost
+        toward = self.toward
+        dirty, self.dirty = self.dirty, set()
+        self.repairs += 1
+
+        # Cells whose first step is now blocked, costs more or is gone
+        broken = []
+        touched = set()
+        for index in dirty:
+            broken.append(index)
+            for cell in self._block(index):
+                touched.add(cell)
+                target = toward[cell]
+                if target != -1 and (cells[cell] or target not in grid.neighbors(cell)):
+                    broken.append(cell)
+        # Reset them and everything upstream. Moves are symmetric, so the
+        # cells stepping into a cell are among its neighbors, except over
+        # moves an edit took away, whose cells are already broken
+        reset = []
+        stack = broken
+        while stack:
+            index = stack.pop()
+            if cost[index] == INF:
+                continue
+            cost[index] = INF
+            toward[index] = -1
+            reset.append(index)
+            stats.reopens += 1
+            for cell in grid.neighbors(index):
+                if toward[cell] == index:
+                    stack.append(cell)
+
+        seeds = []
+        if not cells[self.goal] and cost[self.goal] != 0:
+            cost[self.goal] = 0
+            seeds.append(self.goal)
+        for index in reset:
+            if cells[index] or index == self.goal:
+                continue
+            best, best_step = INF, -1
+            for neighbor, step in grid.edges(index):
+                if cost[neighbor] + step < best:
+                    best, best_step = cost[neighbor] + step, neighbor
+            if best_step != -1:
+                cost[index] = best
+                toward[index] = best_step
+                seeds.append(index)
+        # Cells next to an edit may now offer their neighbors something cheaper
+        seeds.extend(cell for cell in touched if cost[cell] != INF)
+        self._propagate(seeds, observer, stats)
+
+    def next_index(self, index):
+        """Cell index to move to from index, -1 at the goal or when it cannot be reached"""
+        if self.dirty:
+            self.update()
+        return self.toward[index]
+
+    def cost_to_goal(self, index):
+        if self.dirty:
+            self.update()
+        return self.cost[index]
+
+    def path(self, index):
+        """Cell indices from index to the goal, empty when it cannot be reached"""
+        if self.dirty:
+            self.update()
+        if self.cost[index] == INF:
+            return []
+        toward = self.toward
+        path = [index]
+        while toward[index] != -1:
+            index = toward[index]
+            path.append(index)
+        return path
+
+
+class FlowFields:
+    """FlowFields of one grid keyed by goal, evicting the least recently used.
+
+    Positions are (row, col) tuples as in find_path. stats() counts the
+    queries answered by an existing field (hits), the fields built
+    (misses) and evicted, and the repairs after edits.
+    """
+
+    def __init__(self, grid, max_fields=DEFAULT_MAX_FIELDS):
+        if max_fields < 1:
+            raise ValueError(f"max_fields must be at least 1, got {max_fields}")
+        self.grid = grid
+        self.max_fields = max_fields
+        self.fields = OrderedDict()  # goal index -> FlowField
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def field(self, goal, observer=NULL_OBSERVER, stats=None):
+        """FlowField for the goal cell index, built on first use"""
+        field = self.fields.get(goal)
+        if field is not None:
+            self.fields.move_to_end(goal)
+            self.hits += 1
+            field.update(observer, stats)
+            return field
+        self.misses += 1
+        field = self.fields[goal] = FlowField(self.grid, goal, observer, stats)
+        while len(self.fields) > self.max_fields:
+            _, evicted = self.fields.popitem(last=False)
+            evicted.detach()
+            self.evictions += 1
+        return field
+
+    def next_step(self, pos, goal):
+        """Position to move to from pos toward goal, None at the goal or when it cannot be reached"""
+        grid = self.grid
+        index = self.field(grid.index(goal)).next_index(grid.index(pos))
+        return None if index == -1 else grid.pos(index)
+
+    def clear(self):
+        for field in self.fields.values():
+            field.detach()
+        self.fields.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "repairs": sum(field.repairs for field in self.fields.values()),
+            "fields": len(self.fields),
+        }
+
+
+def flow_fields(grid, max_fields=None):
+    """The FlowFields kept in grid.cache, created on first use"""
+    fields = grid.cache.get("flow_fields")
+    if fields is None:
+        fields = grid.cache["flow_fields"] = FlowFields(grid, max_fields or DEFAULT_MAX_FIELDS)
+    elif max_fields is not None:
+        fields.max_fields = max_fields
+    return fields
+
+
+def flowfield_algorithm(grid, start, end, observer=NULL_OBSERVER, max_fields=None):
+    """
+    Flow field
+    Follows the direction field of end from start. The field is built, or
+    repaired after edits, on the first query for end and then shared by
+    every later query for the same goal, so those expand no cells at all.
+    Optimal on weighted and 8-connected grids.
+    """
+    stats = SearchStats()
+    if not connected(grid, start, end):
+        return no_path(stats)
+    stats.lap("setup")
+    field = flow_fields(grid, max_fields).field(end, observer, stats)
+    indices = field.path(start)
+    if not indices:
+        return no_path(stats)
+    stats.lap("search")
+    result = SearchResult([grid.pos(index) for index in indices], path_cost(grid, indices), stats)
+    stats.lap("path")
+    return result
@@ -0,0 +1,251 @@
+import hashlib
+import math
+
+SQRT2 = math.sqrt(2)
+
+# Corner-cutting policies for diagonal moves on 8-connected grids:
+# "never" needs both orthogonal cells beside the move to be free, "no_squeeze"
+# needs at least one of them, and "always" ignores them.
+CORNER_POLICIES = ("never", "no_squeeze", "always")
+
+# (row step, col step) in the order neighbors() returns them
+STRAIGHT = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+_FREE_TABLE = bytes([1]) + bytes(255)
+
+
+class Grid:
+    """Flat barrier grid used by the headless search functions.
+
+    Cell (row, col) lives at index row * cols + col of the cells bytearray,
+    where 1 marks a barrier. Search functions work on these integer indices
+    and keep their own per-cell state in parallel arrays of the same size.
+
+    costs is None on a uniform grid, where every move costs 1. Otherwise it
+    is a buffer of the same size holding the cost of moving into each cell,
+    from 1 to 255, for terrain such as roads, mud or water.
+
+    connectivity is 4 for moves along rows and columns only, or 8 to add
+    diagonal moves, which cost sqrt(2) times the cell they enter. corners
+    is one of CORNER_POLICIES and decides when a diagonal move may pass a
+    barrier's corner.
+
+    The open moves of every cell are kept in masks, one byte per cell with
+    a bit per direction of STRAIGHT + DIAGONAL, so neighbors() is a table
+    lookup. They are computed on first use and set_barrier() keeps them
+    current; code that writes to cells directly must call rebuild_masks()
+    afterwards.
+
+    Structures derived from the barriers (such as the HPA* abstraction)
+    live in the cache dict and register a callable in listeners; every
+    barrier change bumps version and calls each listener with the changed
+    cell indices.
+    """
+
+    def __init__(self, rows, cols, cells=None, costs=None, connectivity=4, corners="never"):
+        if connectivity not in (4, 8):
+            raise ValueError(f"connectivity must be 4 or 8, got {connectivity}")
+        if corners not in CORNER_POLICIES:
+            raise ValueError(f"corners must be one of {CORNER_POLICIES}, got {corners!r}")
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        # Any writable buffer of size bytes works, e.g. a shared memory block
+        self.cells = bytearray(self.size) if cells is None else cells
+        self.costs = costs
+        self.connectivity = connectivity
+        self.corners = corners
+        self.version = 0
+        self.listeners = []
+        self.cache = {}
+        self._deltas, self._moves = self._move_tables()
+        # Built on the first neighbor query, so loading a map stays cheap
+        self.masks = None
+
+    def _move_tables(self):
+        # For every move mask, the index deltas of its moves and (delta, cost
+        # factor) pairs, in the bit order of STRAIGHT + DIAGONAL
+        cols = self.cols
+        directions = STRAIGHT + (DIAGONAL if self.connectivity == 8 else ())
+        deltas = []
+        moves = []
+        for mask in range(1 << len(directions)):
+            chosen = [(dr * cols + dc, SQRT2 if dr and dc else 1)
+                      for bit, (dr, dc) in enumerate(directions) if mask >> bit & 1]
+            deltas.append(tuple(delta for delta, _ in chosen))
+            moves.append(tuple(chosen))
+        return deltas, moves
+
+    def _build_masks(self):
+        """Move mask of every cell, computed for the whole plane at once.
+
+        Each plane below is a big integer holding one 0/1 byte per cell, so
+        shifting it by 8 * delta bits lines every cell up with the cell delta
+        away, and the bitwise operations run over all cells in C.
+        """
+        rows, cols, size = self.rows, self.cols, self.size
+        if not size:
+            return bytearray()
+        free = int.from_bytes(bytes(self.cells).translate(_FREE_TABLE), "little")
+        inside = {
+            (1, 0): int.from_bytes(b"\1" * (size - cols) + bytes(cols), "little"),
+            (-1, 0): int.from_bytes(bytes(cols) + b"\1" * (size - cols), "little"),
+            (0, 1): int.from_bytes((b"\1" * (cols - 1) + b"\0") * rows, "little"),
+            (0, -1): int.from_bytes((b"\0" + b"\1" * (cols - 1)) * rows, "little"),
+        }
+
+        def shifted(delta):
+            # Byte i of the result is the free flag of cell i + delta
+            return free >> 8 * delta if delta >= 0 else free << -8 * delta
+
+        masks = 0
+        for bit, (dr, dc) in enumerate(STRAIGHT):
+            masks |= (shifted(dr * cols + dc) & inside[dr, dc]) << bit
+        if self.connectivity == 8:
+            for bit, (dr, dc) in enumerate(DIAGONAL, len(STRAIGHT)):
+                plane = shifted(dr * cols + dc) & inside[dr, 0] & inside[0, dc]
+                if self.corners == "never":
+                    plane &= shifted(dr * cols) & shifted(dc)
+                elif self.corners == "no_squeeze":
+                    plane &= shifted(dr * cols) | shifted(dc)
+                masks |= plane << bit
+        return bytearray(masks.to_bytes(size, "little"))
+
+    def _cell_mask(self, index):
+        cells = self.cells
+        row, col = divmod(index, self.cols)
+        mask = 0
+        directions = STRAIGHT + (DIAGONAL if self.connectivity == 8 else ())
+        for bit, (dr, dc) in enumerate(directions):
+            r, c = row + dr, col + dc
+            if not (0 <= r < self.rows and 0 <= c < self.cols) or cells[r * self.cols + c]:
+                continue
+            if dr and dc and self.corners != "always":
+                side = cells[r * self.cols + col]
+                other = cells[row * self.cols + c]
+                if (side or other) if self.corners == "never" else (side and other):
+                    continue
+            mask |= 1 << bit
+        self.masks[index] = mask
+
+    def rebuild_masks(self):
+        """Recompute every move mask after writing to cells directly"""
+        self.masks = self._build_masks()
+        return self.masks
+
+    def index(self, pos):
+        row, col = pos
+        return row * self.cols + col
+
+    def pos(self, index):
+        return divmod(index, self.cols)
+
+    def content_hash(self):
+        """Hash of the grid size, barriers and costs, memoized until the next change"""
+        memo = self.cache.get("content_hash")
+        if memo is None or memo[0] != self.version:
+            digest = hashlib.blake2b(self.cells, digest_size=16)
+            digest.update(f"{self.rows}x{self.cols}".encode())
+            if self.connectivity == 8:
+                digest.update(f"8/{self.corners}".encode())
+            if self.costs is not None:
+                digest.update(self.costs)
+            memo = self.cache["content_hash"] = (self.version, digest.hexdigest())
+        return memo[1]
+
+    def in_bounds(self, pos):
+        row, col = pos
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def is_barrier(self, index):
+        return self.cells[index] == 1
+
+    def set_barrier(self, index, blocked=True):
+        value = 1 if blocked else 0
+        if self.cells[index] != value:
+            self.cells[index] = value
+            if self.masks is not None:
+                # Only the cell and the 8 around it can gain or lose a move,
+                # diagonal ones included, whatever the corner policy
+                row, col = divmod(index, self.cols)
+                for r in range(max(row - 1, 0), min(row + 2, self.rows)):
+                    for c in range(max(col - 1, 0), min(col + 2, self.cols)):
+                        self._cell_mask(r * self.cols + c)
+            self._changed(index)
+
+    def cost(self, index):
+        return 1 if self.costs is None else self.costs[index]
+
+    def set_cost(self, index, cost):
+        """Set the cost of moving into a cell; the cost plane is created on first use"""
+        if not 1 <= cost <= 255:
+            raise ValueError(f"Cell costs range from 1 to 255, got {cost}")
+        if self.costs is None:
+            if cost == 1:
+                return
+            self.costs = bytearray(b"\1" * self.size)
+        if self.costs[index] != cost:
+            self.costs[index] = cost
+            self._changed(index)
+
+    def _changed(self, index):
+        self.version += 1
+        for listener in self.listeners:
+            listener((index,))
+
+    def neighbors(self, index):
+        # Same order as the old Spot.update_neighbors: DOWN, UP, RIGHT, LEFT,
+        # then the diagonals on 8-connected grids
+        masks = self.masks
+        if masks is None:
+            masks = self.rebuild_masks()
+        return [index + delta for delta in self._deltas[masks[index]]]
+
+    def edges(self, index, terrain=True):
+        """(neighbor, move cost) pairs; costs are ints unless the grid is 8-connected.
+
+        With terrain=False the cell costs are left out, so every move costs
+        1, or sqrt(2) diagonally.
+        """
+        masks = self.masks
+        if masks is None:
+            masks = self.rebuild_masks()
+        moves = self._moves[masks[index]]
+        costs = self.costs
+        if costs is None or not terrain:
+            return [(index + delta, factor) for delta, factor in moves]
+        return [(index + delta, factor * costs[index + delta]) for delta, factor in moves]
+
+    def reverse_edges(self, index, terrain=True):
+        """(neighbor, cost of the move from neighbor into index) pairs, for backward searches"""
+        masks = self.masks
+        if masks is None:
+            masks = self.rebuild_masks()
+        # Moves are symmetric, so the cells index can reach are those that reach it
+        moves = self._moves[masks[index]]
+        costs = self.costs
+        if costs is None or not terrain:
+            return [(index + delta, factor) for delta, factor in moves]
+        cost = costs[index]
+        return [(index + delta, factor * cost) for delta, factor in moves]
+
+    def move_cost(self, a, b):
+        """Cost of the single move from cell a into the adjacent cell b"""
+        cost = 1 if self.costs is None else self.costs[b]
+        if a % self.cols != b % self.cols and a // self.cols != b // self.cols:
+            return cost * SQRT2
+        return cost
+
+    def distance(self, a, b):
+        """Admissible estimate of the cost between two cells: Manhattan distance
+        on 4-connected grids, octile distance on 8-connected ones"""
+        ar, ac = divmod(a, self.cols)
+        br, bc = divmod(b, self.cols)
+        dr = ar - br if ar > br else br - ar
+        dc = ac - bc if ac > bc else bc - ac
+        if self.connectivity == 4:
+            return dr + dc
+        if dr < dc:
+            dr, dc = dc, dr
+        return dr + (SQRT2 - 1) * dc
@@ -0,0 +1,274 @@
+from collections import deque
+from algorithms.components import connected
+from algorithms.core import NULL_OBSERVER, SearchResult, SearchStats, no_path, path_cost
+from algorithms.openset import HeapOpenSet
+
+# Openings at least this wide get a transition at both ends instead of one in the middle
+WIDE_ENTRANCE = 6
+
+
+def h(p1, p2):
+    x1, y1 = p1
+    x2, y2 = p2
+    return abs(x1 - x2) + abs(y1 - y2)
+
+
+class HierarchicalGraph:
+    """HPA* abstraction of a Grid.
+
+    The grid is cut into cluster_size x cluster_size clusters. Every free
+    opening between two neighboring clusters gets one or two transitions,
+    pairs of facing cells joined by a cost-1 edge, and the transition cells
+    of a cluster are joined by their in-cluster distances. Queries run A* on
+    that small graph and then refine each abstract edge inside one cluster.
+
+    The graph listens to the grid: a barrier change only marks its cluster
+    dirty. At the start of the next query the borders of dirty clusters are
+    recomputed, and only the clusters on either side of them are rebuilt.
+    """
+
+    def __init__(self, grid, cluster_size=10):
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-grid.rows // cluster_size)
+        self.cluster_cols = -(-grid.cols // cluster_size)
+        self.transitions = {}  # border -> [(cell, cell), ...]
+        self.inter = {}  # cell -> cells one step away in a neighboring cluster
+        self.intra = {}  # cluster -> {cell: {cell: distance}}
+        self.dirty = set()
+
+        clusters = [(row, col) for row in range(self.cluster_rows) for col in range(self.cluster_cols)]
+        self._rebuild(clusters, clusters)
+        grid.listeners.append(self.notify_changed)
+
+    def cluster_of(self, index):
+        row, col = self.grid.pos(index)
+        return row // self.cluster_size, col // self.cluster_size
+
+    def notify_changed(self, cells):
+        for index in cells:
+            self.dirty.add(self.cluster_of(index))
+
+    def update(self):
+        """Rebuild the clusters touched by barrier changes since the last query"""
+        if not self.dirty:
+            return
+        affected = set()
+        for row, col in self.dirty:
+            for cluster in ((row, col), (row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                if 0 <= cluster[0] < self.cluster_rows and 0 <= cluster[1] < self.cluster_cols:
+                    affected.add(cluster)
+        dirty = self.dirty
+        self.dirty = set()
+        self._rebuild(dirty, affected)
+
+    def _borders(self, cluster):
+        # A border (row, col, dr, dc) separates cluster (row, col) from (row + dr, col + dc)
+        row, col = cluster
+        borders = []
+        if row > 0:
+            borders.append((row - 1, col, 1, 0))
+        if row < self.cluster_rows - 1:
+            borders.append((row, col, 1, 0))
+        if col > 0:
+            borders.append((row, col - 1, 0, 1))
+        if col < self.cluster_cols - 1:
+            borders.append((row, col, 0, 1))
+        return borders
+
+    def _rebuild(self, dirty, affected):
+        borders = {border for cluster in dirty for border in self._borders(cluster)}
+        for border in borders:
+            for a, b in self.transitions.pop(border, ()):
+                self.inter[a].remove(b)
+                self.inter[b].remove(a)
+            self.transitions[border] = self._find_transitions(border)
+            for a, b in self.transitions[border]:
+                self.inter.setdefault(a, []).append(b)
+                self.inter.setdefault(b, []).append(a)
+        for cluster in affected:
+            self._connect_cluster(cluster)
+
+    def _find_transitions(self, border):
+        grid = self.grid
+        cells = grid.cells
+        size = self.cluster_size
+        row, col, dr, dc = border
+        if dr:
+            # Horizontal border: walk along the columns of the cluster
+            first = grid.index(((row + 1) * size - 1, col * size))
+            step = 1
+            length = min((col + 1) * size, grid.cols) - col * size
+            across = grid.cols
+        else:
+            first = grid.index((row * size, (col + 1) * size - 1))
+            step = grid.cols
+            length = min((row + 1) * size, grid.rows) - row * size
+            across = 1
+
+        transitions = []
+        run_start = None
+        for i in range(length + 1):
+            index = first + i * step
+            open_here = i < length and not cells[index] and not cells[index + across]
+            if open_here and run_start is None:
+                run_start = i
+            elif not open_here and run_start is not None:
+                run_end = i - 1
+                if run_end - run_start + 1 >= WIDE_ENTRANCE:
+                    picks = (run_start, run_end)
+                else:
+                    picks = ((run_start + run_end) // 2,)
+                for pick in picks:
+                    index = first + pick * step
+                    transitions.append((index, index + across))
+                run_start = None
+        return transitions
+
+    def _connect_cluster(self, cluster):
+        nodes = set()
+        for border in self._borders(cluster):
+            for a, b in self.transitions.get(border, ()):
+                nodes.add(a if self.cluster_of(a) == cluster else b)
+        edges = {}
+        for node in nodes:
+            distances, _ = self._local_bfs(node, cluster)
+            edges[node] = {other: distances[other] for other in nodes if other != node and other in distances}
+        self.intra[cluster] = edges
+
+    def _local_bfs(self, source, cluster, target=None):
+        # Plain BFS that never leaves the rows and columns of one cluster
+        grid = self.grid
+        size = self.cluster_size
+        row, col = cluster
+        row_min, row_max = row * size, min((row + 1) * size, grid.rows)
+        col_min, col_max = col * size, min((col + 1) * size, grid.cols)
+        distances = {source: 0}
+        came_from = {}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == target:
+                break
+            for neighbor in grid.neighbors(current):
+                if neighbor in distances:
+                    continue
+                r, c = grid.pos(neighbor)
+                if row_min <= r < row_max and col_min <= c < col_max:
+                    distances[neighbor] = distances[current] + 1
+                    came_from[neighbor] = current
+                    queue.append(neighbor)
+        return distances, came_from
+
+    def _refine(self, u, v):
+        # Cells after u up to and including v for one abstract edge
+        cluster = self.cluster_of(u)
+        if u == v:
+            return []
+        if cluster != self.cluster_of(v):
+            return [v]
+        _, came_from = self._local_bfs(u, cluster, target=v)
+        segment = [v]
+        while segment[-1] != u:
+            segment.append(came_from[segment[-1]])
+        segment.pop()
+        segment.reverse()
+        return segment
+
+    def search(self, start, end, observer=NULL_OBSERVER):
+        stats = SearchStats()
+        self.update()
+        stats.lap("update")
+        grid = self.grid
+        if grid.cells[start] or grid.cells[end]:
+            return no_path(stats)
+
+        start_cluster = self.cluster_of(start)
+        end_cluster = self.cluster_of(end)
+        from_start, _ = self._local_bfs(start, start_cluster)
+        to_end, _ = self._local_bfs(end, end_cluster)
+        end_pos = grid.pos(end)
+
+        def successors(node):
+            if node == start:
+                for other in self.intra[start_cluster]:
+                    if other in from_start:
+                        yield other, from_start[other]
+                for other in self.inter.get(start, ()):
+                    yield other, 1
+                if end in from_start:
+                    yield end, from_start[end]
+                return
+            cluster = self.cluster_of(node)
+            yield from self.intra[cluster][node].items()
+            for other in self.inter.get(node, ()):
+                yield other, 1
+            if cluster == end_cluster and node in to_end:
+                yield end, to_end[node]
+
+        open_set = HeapOpenSet()
+        # Ties on f go to the node closer to the goal, which keeps A* from
+        # fanning out over the many equal-f routes of an open abstract graph
+        start_h = h(grid.pos(start), end_pos)
+        open_set.push(start, (start_h, start_h))
+        came_from = {}
+        g_score = {start: 0}
+        closed = set()
+        stats.pushes = 1
+        stats.lap("setup")
+
+        while open_set:
+            current = open_set.pop()
+
+            if current == end:
+                stats.lap("search")
+                abstract = [end]
+                while abstract[-1] in came_from:
+                    abstract.append(came_from[abstract[-1]])
+                abstract.reverse()
+                path = [start]
+                for u, v in zip(abstract, abstract[1:]):
+                    path.extend(self._refine(u, v))
+                cost = path_cost(grid, path)
+                path = [grid.pos(index) for index in path]
+                stats.lap("path")
+                return SearchResult(path, cost, stats)
+
+            closed.add(current)
+            stats.expanded += 1
+            observer.on_close(current)
+
+            for neighbor, cost in successors(current):
+                temp_g_score = g_score[current] + cost
+                if neighbor not in closed and temp_g_score < g_score.get(neighbor, float("inf")):
+                    if neighbor not in open_set:
+                        observer.on_open(neighbor)
+                    came_from[neighbor] = current
+                    g_score[neighbor] = temp_g_score
+                    stats.pushes += 1
+                    neighbor_h = h(grid.pos(neighbor), end_pos)
+                    open_set.push(neighbor, (temp_g_score + neighbor_h, neighbor_h))
+
+            if len(open_set) > stats.peak_open:
+                stats.peak_open = len(open_set)
+
+        return no_path(stats)
+
+
+def hpa_algorithm(grid, start, end, observer=NULL_OBSERVER, cluster_size=10):
+    """
+    Hierarchical Path-Finding A*
+    The abstraction is built on the first query and kept in grid.cache, so
+    later queries on the same grid only pay for rebuilding edited clusters.
+    Paths are near-optimal: each leg is optimal inside its own cluster.
+    """
+    if grid.connectivity != 4:
+        raise ValueError("HPA* only supports 4-connected grids")
+    if grid.costs is not None:
+        raise ValueError("HPA* only supports uniform-cost grids")
+    if not connected(grid, start, end):
+        return no_path(SearchStats())
+    key = ("hpa", cluster_size)
+    if key not in grid.cache:
+        grid.cache[key] = HierarchicalGraph(grid, cluster_size)
+    return grid.cache[key].search(start, end, observer)
@@ -1,65 +1,193 @@
-from collections import deque
-import pygame
-import globals
-
-def reconstruct_path(came_from, current, draw):
-    while current in came_from:
-        current = came_from[current]
-        current.make_path()
-        draw()
-
-def heuristic(a, b):
-        # Manhattan distance
-        return abs(a.row - b.row) + abs(a.col - b.col)
-def ida_algorithm(draw, grid, start, end):
-    def search(node, g, threshold):
-        f = g + heuristic(node, end)
-        if f > threshold:
-            return f  # return new threshold candidate
-
-        if node == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
-            return "FOUND"
-
-        min_threshold = float("inf")
-        for neighbor in node.neighbors:
-            if neighbor not in visited and not neighbor.is_barrier():
-                visited.add(neighbor)
-                came_from[neighbor] = node
-                neighbor.make_open()
-                globals.state["number_of_node_explored"] += 1
-                draw()
-
-                result = search(neighbor, g + 1, threshold)
-                if result == "FOUND":
-                    return "FOUND"
-                if isinstance(result, (int, float)):
-                    min_threshold = min(min_threshold, result)
-
-        if node != start:
-            node.make_closed()
-        return min_threshold
-
-    threshold = heuristic(start, end)
-    came_from = {}
-    iteration = 0
-
-    while True:
-        visited = {start}
-        globals.state["number_of_node_explored"] = 0  # Reset count each iteration
-        result = search(start, 0, threshold)
-
-        print("Iterative Deepening A* algorithm")
-        print(f"Number of nodes explored: {globals.state['number_of_node_explored']} at state {iteration}")
-        yield  # For visual update step-by-step
-
-        if result == "FOUND":
-            print("Path found using IDA*.")
-            return
-        if result == float("inf"):
-            print("No path found.")
-            return
-
-        threshold = result  # Increase threshold to next f-cost
-        iteration += 1
+from array import array
+
+from algorithms.components import connected
+from algorithms.core import INF, NULL_OBSERVER, SearchResult, SearchStats, no_path, path_cost, score_array
+
+# Default cap on transposition table slots, 36 bytes each: about 36 MiB
+MAX_TABLE_SIZE = 1 << 20
+
+
+class TranspositionTable:
+    """Fixed-size memory of the cells a deepening search has expanded.
+
+    Cell index n lives in slot n % size and evicts whichever cell held the
+    slot before, so the table never grows past size entries. Per slot it
+    keeps the cell (keys, -1 when empty), the cheapest g it was expanded
+    with and the iteration that expanded it, plus two learned heuristics.
+
+    h starts as the heuristic estimate and is raised to the smallest f left
+    unexplored under the cell each time its subtree is searched in full,
+    minus its g, so the heuristic runs once per cell. h_via is the same for paths
+    that entered from the neighbor in via, leaving out the step straight
+    back to it: such a path has a cycle and never leads anywhere better.
+    Without that step h_via keeps growing along corridors and dead ends,
+    where h stays pinned to the threshold by the way back. Both are lower
+    bounds on the cost to the goal like the real heuristic, usually tighter.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.keys = array("i", [-1]) * size
+        self.g = score_array(size)
+        self.iteration = array("i", [0]) * size
+        self.h = array("d", [0.0]) * size
+        self.h_via = array("d", [0.0]) * size
+        self.via = array("i", [-1]) * size
+
+
+def iterative_deepening(grid, start, end, observer, heuristic, edges, table_size=None):
+    """Depth-first iterative deepening on f = g + h with an explicit stack.
+
+    edges(node) yields (neighbor, step) pairs. Each iteration searches
+    every path whose f stays within the threshold, then raises it to the
+    smallest f that went past. The TranspositionTable prunes revisits
+    reached with a worse g than before, or with the same g in the same
+    iteration, and its learned heuristics cut subtrees the last iteration
+    already proved too expensive. reopens counts the expansions of cells
+    the table still held from before.
+    """
+    stats = SearchStats()
+    if not connected(grid, start, end):
+        return no_path(stats)
+    if heuristic(start, end) == INF:
+        return no_path(stats)
+    if start == end:
+        stats.lap("search")
+        return SearchResult([grid.pos(start)], 0, stats)
+
+    size = table_size or min(grid.size, MAX_TABLE_SIZE)
+    table = TranspositionTable(size)
+    keys, best_g, seen_in = table.keys, table.g, table.iteration
+    learned_h, learned_h_via, via = table.h, table.h_via, table.via
+    threshold = heuristic(start, end)
+    iteration = 0
+    stats.pushes = 1
+    stats.lap("setup")
+
+    while True:
+        iteration += 1
+        next_threshold = INF
+        slot = start % size
+        if keys[slot] != start:
+            keys[slot] = start
+            learned_h[slot] = heuristic(start, end)
+            learned_h_via[slot] = 0.0
+            via[slot] = -1
+        best_g[slot] = 0
+        seen_in[slot] = iteration
+        stats.expanded += 1
+        observer.on_close(start)
+        # One entry per cell on the current path: its g, its h for any
+        # arrival, its remaining edges and the smallest f beyond the
+        # threshold found below it so far, without and with the step back
+        # to its parent
+        path = [start]
+        g_path = [0]
+        h_path = [learned_h[slot]]
+        children = [iter(edges(start))]
+        backed = [INF]
+        backed_any = [INF]
+
+        while path:
+            current = path[-1]
+            parent = path[-2] if len(path) > 1 else -1
+            current_g = g_path[-1]
+            value = backed[-1]
+            value_any = backed_any[-1]
+            for neighbor, step in children[-1]:
+                g = current_g + step
+                if neighbor == parent:
+                    if g + h_path[-2] < value_any:
+                        value_any = g + h_path[-2]
+                    continue
+                slot = neighbor % size
+                known = keys[slot] == neighbor
+                if known:
+                    h = h_any = learned_h[slot]
+                    if via[slot] == current and learned_h_via[slot] > h:
+                        h = learned_h_via[slot]
+                else:
+                    h = h_any = heuristic(neighbor, end)
+                f = g + h
+                if f > threshold:
+                    if f < next_threshold:
+                        next_threshold = f
+                elif neighbor == end:
+                    path.append(end)
+                    stats.lap("search")
+                    result = SearchResult([grid.pos(index) for index in path], path_cost(grid, path), stats)
+                    stats.lap("path")
+                    return result
+                elif not known or g < best_g[slot] or (g == best_g[slot] and seen_in[slot] != iteration):
+                    if known:
+                        stats.reopens += 1
+                    else:
+                        keys[slot] = neighbor
+                        learned_h[slot] = h
+                        learned_h_via[slot] = 0.0
+                        via[slot] = -1
+                    best_g[slot] = g
+                    seen_in[slot] = iteration
+                    stats.pushes += 1
+                    stats.expanded += 1
+                    observer.on_open(neighbor)
+                    observer.on_close(neighbor)
+                    backed[-1] = value
+                    backed_any[-1] = value_any
+                    path.append(neighbor)
+                    g_path.append(g)
+                    h_path.append(h_any)
+                    children.append(iter(edges(neighbor)))
+                    backed.append(INF)
+                    backed_any.append(INF)
+                    if len(path) > stats.peak_open:
+                        stats.peak_open = len(path)
+                    break
+                # Cut off here, or reached more cheaply elsewhere: f still
+                # bounds any path to the goal through this move
+                if f < value:
+                    value = f
+                if f < value_any:
+                    value_any = f
+            else:
+                node = path.pop()
+                g = g_path.pop()
+                h_path.pop()
+                children.pop()
+                backed.pop()
+                backed_any.pop()
+                if value < value_any:
+                    value_any = value
+                slot = node % size
+                if keys[slot] == node and value_any - g > learned_h[slot]:
+                    learned_h[slot] = value_any - g
+                if not path:
+                    break
+                if keys[slot] == node:
+                    if via[slot] != path[-1]:
+                        via[slot] = path[-1]
+                        learned_h_via[slot] = value - g
+                    elif value - g > learned_h_via[slot]:
+                        learned_h_via[slot] = value - g
+                # The parent sees this subtree through its step into node,
+                # which is never its own step back
+                if value < backed[-1]:
+                    backed[-1] = value
+                if value < backed_any[-1]:
+                    backed_any[-1] = value
+
+        if next_threshold == INF:
+            return no_path(stats)
+        threshold = next_threshold
+
+
+def ida_algorithm(grid, start, end, observer=NULL_OBSERVER, heuristic=None, table_size=None):
+    # heuristic(a, b) bounds the cost between two cell indices, by default
+    # grid.distance: Manhattan, or octile on 8-connected grids. Terrain costs
+    # are ignored: with many distinct costs the threshold would creep up in
+    # tiny steps, one full iteration each.
+    # table_size caps the transposition table, see iterative_deepening.
+    if heuristic is None:
+        heuristic = grid.distance
+    return iterative_deepening(grid, start, end, observer, heuristic,
+                               lambda node: grid.edges(node, terrain=False), table_size)
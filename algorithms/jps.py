@@ -0,0 +1,156 @@
+import math
+from algorithms.components import connected
+from algorithms.core import NULL_OBSERVER, SearchResult, SearchStats, no_path, parent_array, path_cost, score_array
+from algorithms.openset import HeapOpenSet
+
+SQRT2 = math.sqrt(2)
+
+
+def h(p1, p2, diagonal):
+    """Manhattan distance on 4-connected grids, octile distance on 8-connected ones"""
+    dx = abs(p1[0] - p2[0])
+    dy = abs(p1[1] - p2[1])
+    if diagonal:
+        return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+    return dx + dy
+
+
+def jps_algorithm(grid, start, end, observer=NULL_OBSERVER, diagonal=None):
+    """
+    Jump Point Search on a uniform-cost grid
+    A* that only pushes jump points: straight (and, with diagonal=True,
+    diagonal) runs are scanned without touching the open set and stop at
+    the goal or at a cell with a forced neighbor. Diagonal moves may not
+    cut a barrier corner, so 8-connected grids must use the "never" corner
+    policy. diagonal defaults to whether the grid is 8-connected. Returns
+    the same optimal cost as A*.
+    """
+    if grid.costs is not None:
+        raise ValueError("JPS only supports uniform-cost grids")
+    if grid.connectivity == 8 and grid.corners != "never":
+        raise ValueError(f"JPS only supports the 'never' corner policy, got {grid.corners!r}")
+    stats = SearchStats()
+    if not connected(grid, start, end):
+        return no_path(stats)
+    if diagonal is None:
+        diagonal = grid.connectivity == 8
+    rows = grid.rows
+    cols = grid.cols
+    cells = grid.cells
+    end_pos = grid.pos(end)
+    end_row, end_col = end_pos
+
+    def free(r, c):
+        return 0 <= r < rows and 0 <= c < cols and not cells[r * cols + c]
+
+    def jump(r, c, dr, dc):
+        # Walk from (r, c) in direction (dr, dc) and return the first jump point, or None
+        while True:
+            if not free(r, c):
+                return None
+            if r == end_row and c == end_col:
+                return r, c
+            if dr and dc:
+                if jump(r + dr, c, dr, 0) or jump(r, c + dc, 0, dc):
+                    return r, c
+                if not (free(r + dr, c) and free(r, c + dc)):
+                    return None
+            elif dc:
+                if (free(r - 1, c) and not free(r - 1, c - dc)) or (free(r + 1, c) and not free(r + 1, c - dc)):
+                    return r, c
+            else:
+                if (free(r, c - 1) and not free(r - dr, c - 1)) or (free(r, c + 1) and not free(r - dr, c + 1)):
+                    return r, c
+                # Without diagonals a path may turn off a vertical run anywhere
+                # a horizontal run leads to a jump point.
+                if not diagonal and (jump(r, c + 1, 0, 1) or jump(r, c - 1, 0, -1)):
+                    return r, c
+            r += dr
+            c += dc
+
+    def directions(r, c, parent):
+        # Pruned set of directions to scan from (r, c), given where we came from
+        if parent == -1:
+            if diagonal:
+                return [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+            return [(1, 0), (-1, 0), (0, 1), (0, -1)]
+        pr, pc = grid.pos(parent)
+        dr = (r > pr) - (r < pr)
+        dc = (c > pc) - (c < pc)
+        if not diagonal:
+            return [(dr, dc), (dc, dr), (-dc, -dr)]
+        if dr and dc:
+            return [(dr, 0), (0, dc), (dr, dc)]
+        if dc:
+            return [(0, dc), (1, dc), (-1, dc), (1, 0), (-1, 0)]
+        return [(dr, 0), (dr, 1), (dr, -1), (0, 1), (0, -1)]
+
+    open_set = HeapOpenSet()
+    open_set.push(start, 0)
+    came_from = parent_array(grid.size)
+    g_score = score_array(grid.size)
+    g_score[start] = 0
+    closed = bytearray(grid.size)
+    stats.pushes = 1
+    stats.lap("setup")
+
+    while open_set:
+        current = open_set.pop()
+
+        if current == end:
+            stats.lap("search")
+            path = reconstruct_path(grid, came_from, end)
+            if diagonal and grid.connectivity == 4:
+                # path_cost would count the diagonal steps as straight ones
+                cost = g_score[end]
+            else:
+                cost = path_cost(grid, [grid.index(pos) for pos in path])
+            stats.lap("path")
+            return SearchResult(path, cost, stats)
+
+        closed[current] = 1
+        stats.expanded += 1
+        observer.on_close(current)
+
+        r, c = grid.pos(current)
+        for dr, dc in directions(r, c, came_from[current]):
+            # Diagonal steps must not squeeze between two barriers
+            if dr and dc and not (free(r + dr, c) and free(r, c + dc)):
+                continue
+            point = jump(r + dr, c + dc, dr, dc)
+            if point is None:
+                continue
+            neighbor = point[0] * cols + point[1]
+            if closed[neighbor]:
+                continue
+            temp_g_score = g_score[current] + h((r, c), point, diagonal)
+            if temp_g_score < g_score[neighbor]:
+                if neighbor not in open_set:
+                    observer.on_open(neighbor)
+                came_from[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                stats.pushes += 1
+                open_set.push(neighbor, temp_g_score + h(point, end_pos, diagonal))
+
+        if len(open_set) > stats.peak_open:
+            stats.peak_open = len(open_set)
+
+    return no_path(stats)
+
+
+def reconstruct_path(grid, came_from, end):
+    """Expand the chain of jump points back into every cell along the way"""
+    path = [grid.pos(end)]
+    current = end
+    while came_from[current] != -1:
+        r, c = path[-1]
+        pr, pc = grid.pos(came_from[current])
+        dr = (pr > r) - (pr < r)
+        dc = (pc > c) - (pc < c)
+        while (r, c) != (pr, pc):
+            r += dr
+            c += dc
+            path.append((r, c))
+        current = came_from[current]
+    path.reverse()
+    return path
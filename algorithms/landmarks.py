@@ -0,0 +1,157 @@
+import os
+import struct
+from array import array
+from collections import deque
+
+from algorithms import astar, greedy_bfs, idastar
+from algorithms.components import connected
+from algorithms.core import INF, NULL_OBSERVER, SearchStats, no_path
+
+MAGIC = b"ALT1"
+HEADER = struct.Struct("<4sIII16s")  # magic, rows, cols, landmark count, map hash
+UNREACHED = -1
+
+
+def _distances(grid, source):
+    # Exact BFS step distance from source to every cell, -1 where unreachable
+    dist = array("i", [UNREACHED]) * grid.size
+    dist[source] = 0
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        step = dist[current] + 1
+        for neighbor in grid.neighbors(current):
+            if dist[neighbor] == UNREACHED:
+                dist[neighbor] = step
+                queue.append(neighbor)
+    return dist
+
+
+class Landmarks:
+    """Exact distance tables from K landmark cells, for the ALT heuristic.
+
+    By the triangle inequality, |d(L, a) - d(L, b)| <= d(a, b) for every
+    landmark L, so the largest such difference is an admissible and
+    consistent heuristic that follows walls, unlike Manhattan distance. A
+    cell that a landmark reaches while the other cell is unreachable from
+    it has no path to that cell, and heuristic() returns INF for it.
+
+    The tables are only valid for the barriers they were built on; version
+    records the Grid.version they belong to.
+    """
+
+    def __init__(self, grid, landmarks, tables, version):
+        self.grid = grid
+        self.landmarks = landmarks
+        self.tables = tables
+        self.version = version
+
+    @classmethod
+    def build(cls, grid, count=8):
+        """Pick count landmarks by farthest-point selection and compute their tables"""
+        free = [index for index in range(grid.size) if not grid.cells[index]]
+        landmarks = []
+        tables = []
+        # nearest[i] is the distance from free[i] to the closest landmark so far
+        nearest = [INF] * len(free)
+        candidate = free[0] if free else None
+        while candidate is not None and len(landmarks) < count:
+            table = _distances(grid, candidate)
+            landmarks.append(candidate)
+            tables.append(table)
+            best = -1
+            candidate = None
+            for i, index in enumerate(free):
+                d = table[index]
+                if d != UNREACHED and d < nearest[i]:
+                    nearest[i] = d
+                # Cells no landmark reaches yet come first, so every region gets one
+                if nearest[i] > best and nearest[i] > 0:
+                    best = nearest[i]
+                    candidate = index
+        return cls(grid, landmarks, tables, grid.version)
+
+    def heuristic(self, a, b):
+        best = 0
+        for table in self.tables:
+            da = table[a]
+            db = table[b]
+            if da == UNREACHED or db == UNREACHED:
+                if da != db:
+                    return INF
+                continue
+            diff = da - db if da > db else db - da
+            if diff > best:
+                best = diff
+        return best
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, self.grid.rows, self.grid.cols, len(self.landmarks),
+                                   bytes.fromhex(self.grid.content_hash())))
+            array("i", self.landmarks).tofile(file)
+            for table in self.tables:
+                table.tofile(file)
+
+    @classmethod
+    def load(cls, path, grid):
+        """Read tables saved by save(); returns None if they belong to another map"""
+        with open(path, "rb") as file:
+            magic, rows, cols, count, digest = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or (rows, cols) != (grid.rows, grid.cols) or digest.hex() != grid.content_hash():
+                return None
+            landmarks = array("i")
+            landmarks.fromfile(file, count)
+            tables = []
+            for _ in range(count):
+                table = array("i")
+                table.fromfile(file, grid.size)
+                tables.append(table)
+        return cls(grid, list(landmarks), tables, grid.version)
+
+
+def landmarks_for(grid, count=8, path=None):
+    """Current Landmarks for grid, kept in grid.cache.
+
+    Tables are rebuilt whenever the barriers changed since they were made.
+    With path, matching tables are loaded from that file instead of being
+    rebuilt, and freshly built ones are written back to it.
+    """
+    key = ("alt", count)
+    current = grid.cache.get(key)
+    if current is not None and current.version == grid.version:
+        return current
+    current = None
+    if path is not None and os.path.exists(path):
+        current = Landmarks.load(path, grid)
+    if current is None:
+        current = Landmarks.build(grid, count)
+        if path is not None:
+            current.save(path)
+    grid.cache[key] = current
+    return current
+
+
+def alt_algorithm(grid, start, end, observer=NULL_OBSERVER, landmarks=8, path=None):
+    """A* with the ALT landmark heuristic"""
+    # Checked before the tables are built, which costs far more than the search
+    if not connected(grid, start, end):
+        return no_path(SearchStats())
+    heuristic = landmarks_for(grid, landmarks, path).heuristic
+    return astar.astar_algorithm(grid, start, end, observer, heuristic=heuristic)
+
+
+def ida_alt_algorithm(grid, start, end, observer=NULL_OBSERVER, landmarks=8, path=None):
+    """IDA* with the ALT landmark heuristic"""
+    if not connected(grid, start, end):
+        return no_path(SearchStats())
+    heuristic = landmarks_for(grid, landmarks, path).heuristic
+    return idastar.ida_algorithm(grid, start, end, observer, heuristic=heuristic)
+
+
+def greedy_alt_algorithm(grid, start, end, observer=NULL_OBSERVER, landmarks=8, path=None):
+    """Greedy best-first search ranked by the ALT landmark heuristic"""
+    if not connected(grid, start, end):
+        return no_path(SearchStats())
+    heuristic = landmarks_for(grid, landmarks, path).heuristic
+    return greedy_bfs.greedy_bfs_algorithm(grid, start, end, observer, heuristic=heuristic)
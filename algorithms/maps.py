@@ -0,0 +1,153 @@
+"""Map files for the headless Grid.
+
+Two formats are understood:
+
+* text (maps/*.txt): one line per grid column, 'x' for a barrier, 's' for
+  the start and 'e' for the end. A digit '2' to '9' is free terrain that
+  costs that much to enter; anything else is free and costs 1.
+* binary (.map): a 32-byte header followed by the barrier plane. The plane
+  is either bit-packed, 1 bit per cell in row-major order with the lowest
+  bit first, or one byte per cell. A byte plane is mapped straight into
+  the Grid with mmap, so loading it copies nothing. If the header flags
+  have HAS_COSTS set, a cost plane of one byte per cell follows, and it
+  is always mapped without copying.
+
+Convert a text map with:
+
+    python -m algorithms.maps maps/map.txt maps/map.map
+"""
+import argparse
+import mmap
+import struct
+
+from algorithms.grid import Grid
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, it only speeds up (un)packing
+    np = None
+
+MAGIC = b"PFM1"
+HEADER = struct.Struct("<4sBB2xIIqq")  # magic, encoding, flags, rows, cols, start, end
+PACKED = 0
+BYTES = 1
+
+# Header flags. Files written before costs existed have 0 in this byte.
+HAS_COSTS = 1
+
+_BARRIER_TABLE = bytes(1 if chr(i) == 'x' else 0 for i in range(256))
+_COST_TABLE = bytes(i - ord('0') if ord('2') <= i <= ord('9') else 1 for i in range(256))
+_DIGITS = frozenset(b"23456789")
+
+
+def load_text_map(path):
+    """Read a maps/*.txt file into a Grid sized to fit it.
+
+    Returns (grid, start, end) with start/end as (row, col) or None if the
+    map does not mark them.
+    """
+    with open(path, "rb") as file:
+        lines = file.read().splitlines()
+    rows = max((len(line) for line in lines), default=0)
+    cols = len(lines)
+    cells = bytearray(rows * cols)
+    # Maps without terrain digits keep the unit-cost Grid
+    weighted = any(_DIGITS.intersection(line) for line in lines)
+    costs = bytearray(b"\1" * (rows * cols)) if weighted else None
+    start = None
+    end = None
+    for i, line in enumerate(lines):
+        # Line i is column i, so its cells sit cols apart in the flat plane
+        cells[i::cols] = line.translate(_BARRIER_TABLE).ljust(rows, b"\0")
+        if weighted:
+            costs[i::cols] = line.translate(_COST_TABLE).ljust(rows, b"\1")
+        if b"s" in line:
+            start = (line.index(b"s"), i)
+        if b"e" in line:
+            end = (line.index(b"e"), i)
+    # The Grid is made last, so its move masks see the filled plane
+    return Grid(rows, cols, cells, costs), start, end
+
+
+def _pack(cells):
+    if np is not None:
+        return np.packbits(np.frombuffer(cells, dtype=np.uint8), bitorder="little").tobytes()
+    # Every cell byte is 0 or 1, so shifting the whole plane as one integer
+    # moves each cell into its bit without carries between bytes.
+    cells = bytes(cells)
+    packed = 0
+    for bit in range(8):
+        packed |= int.from_bytes(cells[bit::8], "little") << bit
+    return packed.to_bytes((len(cells) + 7) // 8, "little")
+
+
+def _unpack(data, size):
+    if np is not None:
+        return bytearray(np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=size, bitorder="little"))
+    packed = int.from_bytes(data, "little")
+    ones = int.from_bytes(b"\x01" * len(data), "little")
+    cells = bytearray(size)
+    for bit in range(8):
+        plane = ((packed >> bit) & ones).to_bytes(len(data), "little")
+        cells[bit::8] = plane[:len(range(bit, size, 8))]
+    return cells
+
+
+def save_binary_map(path, grid, start=None, end=None, packed=True):
+    start_index = -1 if start is None else grid.index(start)
+    end_index = -1 if end is None else grid.index(end)
+    encoding = PACKED if packed else BYTES
+    flags = 0 if grid.costs is None else HAS_COSTS
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, encoding, flags, grid.rows, grid.cols, start_index, end_index))
+        file.write(_pack(grid.cells) if packed else grid.cells)
+        if grid.costs is not None:
+            file.write(grid.costs)
+
+
+def load_binary_map(path):
+    """Load a .map file through mmap; returns (grid, start, end) like load_text_map.
+
+    The mapping is copy-on-write, so barrier edits on a zero-copy grid never
+    reach the file.
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    magic, encoding, flags, rows, cols, start, end = HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a binary map file")
+    size = rows * cols
+    plane = memoryview(mapped)[HEADER.size:]
+    if encoding == BYTES:
+        length = size
+    elif encoding == PACKED:
+        length = (size + 7) // 8
+    else:
+        raise ValueError(f"{path} has unknown plane encoding {encoding}")
+    weighted = flags & HAS_COSTS
+    if len(plane) < length + (size if weighted else 0):
+        raise ValueError(f"{path} is truncated")
+    cells = plane[:size] if encoding == BYTES else _unpack(plane[:length], size)
+    grid = Grid(rows, cols, cells, plane[length:length + size] if weighted else None)
+    return grid, None if start < 0 else grid.pos(start), None if end < 0 else grid.pos(end)
+
+
+def load_map(path):
+    """Load either format, telling them apart by the binary magic"""
+    with open(path, "rb") as file:
+        binary = file.read(len(MAGIC)) == MAGIC
+    return load_binary_map(path) if binary else load_text_map(path)
+
+
+def convert_text_map(source, target, packed=True):
+    grid, start, end = load_text_map(source)
+    save_binary_map(target, grid, start, end, packed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a text map into the binary map format")
+    parser.add_argument("source")
+    parser.add_argument("target")
+    parser.add_argument("--bytes", action="store_true", help="store one byte per cell for zero-copy loading")
+    args = parser.parse_args()
+    convert_text_map(args.source, args.target, packed=not args.bytes)
@@ -0,0 +1,238 @@
+"""Open sets for the best-first searches.
+
+All three queues hold cell indices (or any hashable node) and share one
+interface:
+
+    push(node, priority)  queue node, or change the priority it is queued with
+    pop()                 remove and return the node with the lowest priority
+    peek()                (priority, node) of that node without removing it
+    remove(node)          drop node if it is queued
+    len(q), node in q     number of queued nodes, membership
+    iter(q)               the queued nodes, in no particular order
+
+Ties between equal priorities are broken first in, first out, and
+changing a priority counts as arriving anew. None of them take a lock,
+unlike queue.PriorityQueue.
+"""
+from collections import deque
+from heapq import heappop, heappush
+
+from algorithms.core import INF
+
+
+class HeapOpenSet:
+    """heapq binary heap with lazy deletion.
+
+    Changing a priority pushes a fresh entry and leaves the old one in the
+    heap; pop() and peek() discard entries that are no longer the node's
+    latest. Priorities may be any comparable values, such as tuples for
+    secondary tie-breaking.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.live = {}  # queued node -> tie-breaker of its latest entry
+        self.count = 0  # entries ever pushed, also the FIFO tie-breaker
+
+    def __len__(self):
+        return len(self.live)
+
+    def __contains__(self, node):
+        return node in self.live
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def push(self, node, priority):
+        self.count += 1
+        self.live[node] = self.count
+        heappush(self.heap, (priority, self.count, node))
+
+    def _discard_stale(self):
+        heap = self.heap
+        live = self.live
+        while heap and live.get(heap[0][2]) != heap[0][1]:
+            heappop(heap)
+
+    def pop(self):
+        self._discard_stale()
+        node = heappop(self.heap)[2]
+        del self.live[node]
+        return node
+
+    def peek(self):
+        self._discard_stale()
+        if not self.heap:
+            return INF, None
+        priority, _, node = self.heap[0]
+        return priority, node
+
+    def remove(self, node):
+        self.live.pop(node, None)
+
+
+class IndexedHeap:
+    """Binary heap that knows where every node sits, for true decrease-key.
+
+    Changing a priority moves the node's single entry up or down in place,
+    so the heap never holds more than one entry per node. The sifting runs
+    in Python, which makes it slower per operation than HeapOpenSet but
+    bounded in memory when priorities change often.
+    """
+
+    def __init__(self):
+        self.heap = []  # [priority, tie, node] entries
+        self.position = {}  # node -> index of its entry in heap
+        self.count = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, node):
+        return node in self.position
+
+    def __iter__(self):
+        return iter(self.position)
+
+    def push(self, node, priority):
+        self.count += 1
+        i = self.position.get(node)
+        if i is None:
+            self.heap.append([priority, self.count, node])
+            self.position[node] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+            return
+        entry = self.heap[i]
+        lower = priority < entry[0]
+        entry[0] = priority
+        entry[1] = self.count
+        if lower:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def pop(self):
+        node = self.heap[0][2]
+        self._delete(0)
+        return node
+
+    def peek(self):
+        if not self.heap:
+            return INF, None
+        return self.heap[0][0], self.heap[0][2]
+
+    def remove(self, node):
+        i = self.position.get(node)
+        if i is not None:
+            self._delete(i)
+
+    def _delete(self, i):
+        heap = self.heap
+        del self.position[heap[i][2]]
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            self.position[last[2]] = i
+            self._sift_down(i)
+            self._sift_up(i)
+
+    def _sift_up(self, i):
+        heap = self.heap
+        position = self.position
+        entry = heap[i]
+        while i:
+            parent = (i - 1) >> 1
+            # Ties are unique, so comparing entries never reaches the node
+            if heap[parent] < entry:
+                break
+            heap[i] = heap[parent]
+            position[heap[i][2]] = i
+            i = parent
+        heap[i] = entry
+        position[entry[2]] = i
+
+    def _sift_down(self, i):
+        heap = self.heap
+        position = self.position
+        size = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry < heap[child]:
+                break
+            heap[i] = heap[child]
+            position[heap[i][2]] = i
+            i = child
+        heap[i] = entry
+        position[entry[2]] = i
+
+
+class BucketQueue:
+    """Dial's bucket queue for small non-negative integer priorities.
+
+    One FIFO bucket per priority value, scanned upwards from the last
+    popped priority, so push and pop are O(1) amortized. It is monotone:
+    nodes must never be pushed below the priority last popped, which holds
+    for Dijkstra and for A* with a consistent integer heuristic. Stale
+    entries are skipped lazily as in HeapOpenSet.
+    """
+
+    def __init__(self):
+        self.buckets = []  # priority -> deque of (tie, node) entries
+        self.current = 0
+        self.live = {}
+        self.count = 0
+
+    def __len__(self):
+        return len(self.live)
+
+    def __contains__(self, node):
+        return node in self.live
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def push(self, node, priority):
+        # Integral floats are accepted too, as kept in score_array g values
+        slot = int(priority)
+        if slot != priority or slot < self.current:
+            raise ValueError(f"priority {priority} is not an integer at or above {self.current}")
+        self.count += 1
+        self.live[node] = self.count
+        buckets = self.buckets
+        while len(buckets) <= slot:
+            buckets.append(deque())
+        buckets[slot].append((self.count, node))
+
+    def _advance(self):
+        # Move current to the first bucket whose head is a live entry
+        buckets = self.buckets
+        live = self.live
+        while self.current < len(buckets):
+            bucket = buckets[self.current]
+            while bucket:
+                tie, node = bucket[0]
+                if live.get(node) == tie:
+                    return True
+                bucket.popleft()
+            self.current += 1
+        return False
+
+    def pop(self):
+        if not self._advance():
+            raise IndexError("pop from an empty BucketQueue")
+        node = self.buckets[self.current].popleft()[1]
+        del self.live[node]
+        return node
+
+    def peek(self):
+        if not self._advance():
+            return INF, None
+        return self.current, self.buckets[self.current][0][1]
+
+    def remove(self, node):
+        self.live.pop(node, None)
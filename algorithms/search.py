@@ -0,0 +1,47 @@
+from algorithms import arastar, astar, dfs, bfs, ucs, bi_direction_search, bidirectional_astar, iddfs, idastar, beamsearch, greedy_bfs, jps, hpa, dstar_lite, landmarks, smastar, flowfield
+from algorithms.core import NULL_OBSERVER
+
+try:
+    from algorithms import wavefront
+except ImportError:  # NumPy is optional, only the wavefront BFS needs it
+    wavefront = None
+
+ALGORITHMS = {
+    "ucs": ucs.ucs_algorithm,
+    "dfs": dfs.dfs_algorithm,
+    "bfs": bfs.bfs_algorithm,
+    "astar": astar.astar_algorithm,
+    "arastar": arastar.arastar_algorithm,
+    "smastar": smastar.smastar_algorithm,
+    "jps": jps.jps_algorithm,
+    "hpa": hpa.hpa_algorithm,
+    "dstar_lite": dstar_lite.dstar_lite_algorithm,
+    "flowfield": flowfield.flowfield_algorithm,
+    "bidirectional": bi_direction_search.bi_directional_search_algorithm,
+    "bidirectional_astar": bidirectional_astar.bidirectional_astar_algorithm,
+    "iddfs": iddfs.iddfs_algorithm,
+    "idastar": idastar.ida_algorithm,
+    "greedy_bfs": greedy_bfs.greedy_bfs_algorithm,
+    "alt": landmarks.alt_algorithm,
+    "idastar_alt": landmarks.ida_alt_algorithm,
+    "greedy_bfs_alt": landmarks.greedy_alt_algorithm,
+    "beam": beamsearch.beam_search_algorithm,
+}
+
+if wavefront is not None:
+    ALGORITHMS["bfs_wavefront"] = wavefront.wavefront_bfs_algorithm
+
+
+def find_path(grid, start, end, algorithm="astar", observer=NULL_OBSERVER, **options):
+    """Run one of ALGORITHMS on a Grid between two (row, col) positions.
+
+    Returns a SearchResult with the path, its cost and the number of
+    expanded nodes. Extra keyword options go to the algorithm itself, for
+    example beam_width for "beam" or diagonal for "jps".
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {sorted(ALGORITHMS)}")
+    for pos in (start, end):
+        if not grid.in_bounds(pos):
+            raise ValueError(f"Position {pos} is outside the {grid.rows}x{grid.cols} grid")
+    return ALGORITHMS[algorithm](grid, grid.index(start), grid.index(end), observer=observer, **options)
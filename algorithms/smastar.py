@@ -0,0 +1,260 @@
+"""Simplified Memory-bounded A* (SMA*, Russell 1992).
+
+The search keeps at most max_nodes cells in memory, in a tree rooted at
+start, instead of arrays over the whole grid. When it is full, the leaf
+with the highest f (the shallowest on ties) is forgotten and its parent
+remembers the child's f, so that subtree is regenerated only once
+everything cheaper has been tried, and then starting from that f. Every
+node's f is backed up to the smallest f below it, and becomes infinite
+once nothing below it fits in memory.
+
+A cell reached again with a g no better than its copy in memory is
+skipped, and a copy with a worse g is dropped with its subtree, so each
+cell is held at most once; on equal g the shallower copy is kept. The
+result is optimal whenever the optimal path, start and end included,
+fits in max_nodes cells; otherwise it may be a costlier path that does
+fit, or no path at all.
+
+A breadth-first search back from end counts the fewest moves from every
+cell to it, around the barriers. A cell is only generated when a path
+through it, its ancestors included, can still fit in max_nodes cells,
+and when even the shortest path from start does not fit the search
+returns no path without expanding anything. The tighter the cap, the
+more often subtrees are forgotten and then regenerated, each time from
+scratch; max_expansions bounds that work.
+"""
+from array import array
+
+from algorithms.components import connected
+from algorithms.core import INF, NULL_OBSERVER, SearchResult, SearchStats, no_path, path_cost
+from algorithms.openset import IndexedHeap
+
+# Most bytes a held node took under tracemalloc, on the benchmark maps and
+# on random open, noisy and weighted grids with caps close to the path
+# length: the _Node, its children list, a forgotten dict full of its
+# siblings, its entries in nodes and both IndexedHeaps, and their spare
+# room after a resize. Rounded up; turns max_bytes into max_nodes.
+NODE_BYTES = 1024
+
+# Allocated whatever the cap: the empty heaps, the closures and the stats
+BASE_BYTES = 8 * 1024
+
+DEFAULT_MAX_NODES = 1 << 14
+
+# Diagonal moves make costs sums of sqrt(2) multiples, so costs closer than
+# this are taken as equal
+EPSILON = 1e-9
+
+
+def step_counts(grid, end):
+    """Fewest moves from every cell index to end, -1 where it cannot be reached.
+
+    Kept in grid.cache for the last end asked for, until the barriers change.
+    """
+    memo = grid.cache.get("step_counts")
+    if memo is not None and memo[0] == grid.version and memo[1] == end:
+        return memo[2]
+    steps = array("i", [-1]) * grid.size
+    if not grid.cells[end]:
+        steps[end] = 0
+        frontier = [end]
+        count = 0
+        while frontier:
+            count += 1
+            reached = []
+            for cell in frontier:
+                for neighbor in grid.neighbors(cell):
+                    if steps[neighbor] == -1:
+                        steps[neighbor] = count
+                        reached.append(neighbor)
+            frontier = reached
+    grid.cache["step_counts"] = (grid.version, end, steps)
+    return steps
+
+
+class _Node:
+    __slots__ = ("g", "f", "parent", "depth", "children", "forgotten", "expanded")
+
+    def __init__(self, g, f, parent, depth):
+        self.g = g
+        self.f = f  # lower bound on any path through the node, raised by backups
+        self.parent = parent
+        self.depth = depth
+        self.children = []
+        self.forgotten = {}  # child cell -> f, for children dropped to save memory
+        self.expanded = False
+
+
+def smastar_algorithm(grid, start, end, observer=NULL_OBSERVER, heuristic=None, max_nodes=None, max_bytes=None,
+                      max_expansions=None):
+    """
+    Simplified Memory-bounded A* (SMA*)
+    Holds at most max_nodes search nodes, or as many as max_bytes allows
+    at NODE_BYTES each after BASE_BYTES, forgetting the worst leaves when
+    full; see the module docstring. max_bytes bounds what the search
+    allocates, not the grid's move masks, component index and step_counts,
+    which are built on first use and kept. After max_expansions expansions
+    the search gives up and returns no path.
+    stats.peak_open is the most nodes held at once and stats.reopens the
+    expansions that regenerated forgotten children.
+    heuristic(a, b) bounds the cost between two cell indices, grid.distance by default.
+    """
+    stats = SearchStats()
+    if not connected(grid, start, end):
+        return no_path(stats)
+    if heuristic is None:
+        heuristic = grid.distance
+    if max_nodes is None:
+        if max_bytes is None:
+            max_nodes = DEFAULT_MAX_NODES
+        elif max_bytes < BASE_BYTES + NODE_BYTES:
+            raise ValueError(f"max_bytes must be at least {BASE_BYTES + NODE_BYTES}, got {max_bytes}")
+        else:
+            max_nodes = (max_bytes - BASE_BYTES) // NODE_BYTES
+    if max_nodes < 1:
+        raise ValueError(f"max_nodes must be at least 1, got {max_nodes}")
+    steps = step_counts(grid, end)
+    # No path, start and end included, can fit in fewer cells than this
+    if steps[start] + 1 > max_nodes:
+        return no_path(stats)
+
+    root = _Node(0, heuristic(start, end), -1, 0)
+    nodes = {start: root}
+    # Nodes with successors still to generate, deepest first among equal f
+    open_set = IndexedHeap()
+    open_set.push(start, (root.f, 0))
+    # Nodes without children in memory: the ones that may be forgotten
+    leaves = IndexedHeap()
+    leaves.push(start, (-root.f, 0))
+    current = -1
+    stats.pushes = 1
+    stats.peak_open = 1
+    stats.lap("setup")
+
+    def backup(cell):
+        # Raise the f of an expanded node, then of its ancestors, to the
+        # smallest f below it; infinite once nothing below can fit. The
+        # node being expanded is backed up once its children are all back
+        while cell != -1 and cell != current:
+            node = nodes[cell]
+            backed = min([nodes[child].f for child in node.children], default=INF)
+            if node.forgotten:
+                backed = min(backed, min(node.forgotten.values()))
+            if backed <= node.f:
+                return
+            node.f = backed
+            if not node.children:
+                leaves.push(cell, (-backed, node.depth))
+            cell = node.parent
+
+    def detach(cell, parent_cell):
+        # Unlink a removed node from its parent, which may become a leaf
+        parent = nodes[parent_cell]
+        parent.children.remove(cell)
+        if parent_cell != current:
+            if not parent.children:
+                leaves.push(parent_cell, (-parent.f, parent.depth))
+            backup(parent_cell)
+
+    def forget(cell):
+        # Drop a leaf to make room; its parent remembers its f
+        node = nodes.pop(cell)
+        leaves.remove(cell)
+        open_set.remove(cell)
+        parent = nodes[node.parent]
+        parent.forgotten[cell] = node.f
+        if node.f != INF:
+            open_set.push(node.parent, (min(parent.forgotten.values()), -parent.depth))
+        detach(cell, node.parent)
+
+    def drop(cell):
+        # Remove a node, and its subtree, now reached more cheaply
+        parent_cell = nodes[cell].parent
+        stack = [cell]
+        while stack:
+            below = stack.pop()
+            stack.extend(nodes.pop(below).children)
+            open_set.remove(below)
+            leaves.remove(below)
+        detach(cell, parent_cell)
+
+    while open_set:
+        (bound, _), current = open_set.peek()
+        if bound == INF:
+            break
+        open_set.pop()
+        node = nodes[current]
+        if current == end:
+            path = [current]
+            while node.parent != -1:
+                path.append(node.parent)
+                node = nodes[node.parent]
+            path.reverse()
+            stats.lap("search")
+            result = SearchResult([grid.pos(index) for index in path], path_cost(grid, path), stats)
+            stats.lap("path")
+            return result
+
+        if stats.expanded == max_expansions:
+            break
+        stats.expanded += 1
+        observer.on_close(current)
+        # While expanding, the node itself must not be forgotten to make room
+        leaves.remove(current)
+        if node.expanded:
+            # Regenerate only the cheapest forgotten children, each starting
+            # from the f it had backed up before it was forgotten
+            stats.reopens += 1
+            wanted = {cell: f for cell, f in node.forgotten.items() if f <= bound + EPSILON}
+            for cell in wanted:
+                del node.forgotten[cell]
+        else:
+            wanted = None
+            node.expanded = True
+
+        depth = node.depth + 1
+        for neighbor, step in grid.edges(current):
+            if wanted is not None and neighbor not in wanted:
+                continue
+            # A path through the cell needs at least this many nodes held at
+            # once, its ancestors included
+            if depth + steps[neighbor] + 1 > max_nodes:
+                continue
+            g = node.g + step
+            other = nodes.get(neighbor)
+            if other is not None:
+                # On equal costs the shallower copy stays, as it leaves more
+                # room below it
+                if other.g < g - EPSILON or other.g <= g + EPSILON and other.depth <= depth:
+                    continue
+                drop(neighbor)
+            while len(nodes) >= max_nodes and leaves:
+                forget(leaves.peek()[1])
+            if len(nodes) >= max_nodes:
+                continue
+            # Pathmax: a child's f is never below its parent's
+            f = g + heuristic(neighbor, end)
+            if f < bound:
+                f = bound
+            if wanted is not None and f < wanted[neighbor]:
+                f = wanted[neighbor]
+            nodes[neighbor] = _Node(g, f, current, depth)
+            node.children.append(neighbor)
+            open_set.push(neighbor, (f, -depth))
+            leaves.push(neighbor, (-f, depth))
+            stats.pushes += 1
+            observer.on_open(neighbor)
+        if len(nodes) > stats.peak_open:
+            stats.peak_open = len(nodes)
+
+        # With no children left, because every successor is held more cheaply
+        # elsewhere or cannot fit, the node's f becomes infinite; it stays as
+        # a leaf so that its parent stops regenerating it
+        expanded, current = current, -1
+        if node.forgotten:
+            open_set.push(expanded, (min(node.forgotten.values()), -node.depth))
+        if not node.children:
+            leaves.push(expanded, (-node.f, node.depth))
+        backup(expanded)
+
+    return no_path(stats)
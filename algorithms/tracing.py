@@ -0,0 +1,51 @@
+"""Opt-in tracing for the headless searches.
+
+Searches report their counters in SearchResult.stats; these observers are
+only for watching a search while it runs. tracer() hands back
+NULL_OBSERVER unless the logger is enabled for DEBUG, so leaving it in
+place costs nothing once logging is turned down.
+"""
+import logging
+
+from algorithms.core import NULL_OBSERVER, Observer
+
+logger = logging.getLogger("algorithms.search")
+
+
+class Sampler(Observer):
+    """Forward only every nth open and close event to another observer"""
+
+    def __init__(self, observer, every=100):
+        self.observer = observer
+        self.every = every
+        self.opens = 0
+        self.closes = 0
+
+    def on_open(self, index):
+        self.opens += 1
+        if self.opens % self.every == 0:
+            self.observer.on_open(index)
+
+    def on_close(self, index):
+        self.closes += 1
+        if self.closes % self.every == 0:
+            self.observer.on_close(index)
+
+
+class LogTracer(Observer):
+    """Log every expansion as a (row, col) position at DEBUG level"""
+
+    def __init__(self, grid, log=logger):
+        self.grid = grid
+        self.log = log
+
+    def on_close(self, index):
+        self.log.debug("expand %s", self.grid.pos(index))
+
+
+def tracer(grid, every=1, log=logger):
+    """Observer logging every nth expansion, or NULL_OBSERVER when DEBUG is off"""
+    if not log.isEnabledFor(logging.DEBUG):
+        return NULL_OBSERVER
+    trace = LogTracer(grid, log)
+    return trace if every == 1 else Sampler(trace, every)
@@ -1,53 +1,48 @@
-from collections import deque
-import pygame
-import globals
-
-def reconstruct_path(came_from, current, draw):
-    while current in came_from:
-        current = came_from[current]
-        current.make_path()
-        draw()
-
-def ucs_algorithm(draw, grid, start, end):
-    from queue import PriorityQueue
-
-    count = 0
-    count_state = 0
-    open_set = PriorityQueue()
-    open_set.put((0, count, start))
-    came_from = {}
-    g_score = {spot: float("inf") for row in grid for spot in row}
+from algorithms.components import connected
+from algorithms.core import INF, NULL_OBSERVER, SearchStats, make_result, no_path, parent_array, score_array
+from algorithms.openset import BucketQueue, HeapOpenSet
+
+def ucs_algorithm(grid, start, end, observer=NULL_OBSERVER, queue=None):
+    # Move costs on 4-connected grids are small integers, so Dial's bucket queue
+    # is the default open set there; diagonal moves cost sqrt(2) and need a heap.
+    # UCS's frontier grows wide on open and weighted maps, where the buckets
+    # ran about 1.6x faster than HeapOpenSet in benchmarks/open_sets.py, at
+    # the price of up to 20% on mazes.
+    stats = SearchStats()
+    if not connected(grid, start, end):
+        return no_path(stats)
+    queue = queue or (BucketQueue if grid.connectivity == 4 else HeapOpenSet)
+    open_set = queue()
+    open_set.push(start, 0)
+    came_from = parent_array(grid.size)
+    g_score = score_array(grid.size)
     g_score[start] = 0
+    stats.pushes = 1
+    stats.lap("setup")
 
-    open_set_hash = {start}
+    while open_set:
+        current = open_set.pop()
 
-    while not open_set.empty():
-        yield  # Yield for each loop iteration
+        if current == end:
+            return make_result(grid, came_from, end, stats)
 
-        current = open_set.get()[2]
-        open_set_hash.remove(current)
+        stats.expanded += 1
+        observer.on_close(current)
 
-        if current == end:
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
-            return
-        count_state += 1
-        for neighbor in current.neighbors:
-            temp_g_score = g_score[current] + 1
-            globals.state["number_of_node_explored"] += 1
+        current_g = g_score[current]
+        for neighbor, step in grid.edges(current):
+            temp_g_score = current_g + step
             if temp_g_score < g_score[neighbor]:
+                if neighbor not in open_set:
+                    if g_score[neighbor] != INF:
+                        stats.reopens += 1
+                    observer.on_open(neighbor)
                 came_from[neighbor] = current
                 g_score[neighbor] = temp_g_score
-                if neighbor not in open_set_hash:
-                    count += 1
-                    open_set.put((g_score[neighbor], count, neighbor))
-                    open_set_hash.add(neighbor)
-                    neighbor.make_open()
+                open_set.push(neighbor, temp_g_score)
+                stats.pushes += 1
 
-        draw()
-        if current != start:
-            current.make_closed()
-        print("Uniform-cost search algorithm")
-        print(f"Number of nodes explored: {globals.state["number_of_node_explored"]} at state {count_state}")
+        if len(open_set) > stats.peak_open:
+            stats.peak_open = len(open_set)
 
-    return
\ No newline at end of file
+    return no_path(stats)
@@ -0,0 +1,56 @@
+from algorithms.core import Observer
+
+OPEN = 0
+CLOSE = 1
+
+
+class Recorder(Observer):
+    """Observer that keeps every open/close event for later replay."""
+
+    def __init__(self):
+        self.events = []
+
+    def on_open(self, index):
+        self.events.append((OPEN, index))
+
+    def on_close(self, index):
+        self.events.append((CLOSE, index))
+
+
+def animate(search, spots, start, end, **options):
+    """Run a headless search on a Spot grid and replay it for the GUI.
+
+    The Spots are views over one shared Grid, so the search runs directly
+    on that model. It runs to completion up front; the returned generator
+    then colors one expansion per next() call, followed by one path cell
+    per call, so the pygame loop can keep drawing between steps. The
+    SearchResult is the generator's return value.
+    """
+    model = start.model
+    recorder = Recorder()
+    result = search(model, start.index, end.index, observer=recorder, **options)
+
+    for kind, index in recorder.events:
+        row, col = model.pos(index)
+        spot = spots[row][col]
+        if spot is start or spot is end:
+            continue
+        if kind == OPEN:
+            spot.make_open()
+        else:
+            yield
+            spot.make_closed()
+
+    for row, col in result.path[1:-1]:
+        yield
+        spots[row][col].make_path()
+
+    stats = result.stats
+    if result.found:
+        print(f"Path cost: {result.cost}")
+    else:
+        print("No path found.")
+    print(f"Number of nodes explored: {stats.expanded} (pushes {stats.pushes}, reopens {stats.reopens}, "
+          f"peak open set {stats.peak_open})")
+    print(f"Search time: {sum(stats.phases.values()) * 1000:.2f} ms")
+    return result
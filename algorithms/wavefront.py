@@ -0,0 +1,101 @@
+import numpy as np
+
+from algorithms.components import connected
+from algorithms.core import NULL_OBSERVER, SearchResult, SearchStats, no_path, path_cost
+
+UNREACHED = -1
+
+
+def _advance(frontier, unvisited, slot, cols, size):
+    """Return the unvisited cells 4-adjacent to any cell of frontier.
+
+    frontier is an array of flat indices; the whole level is stepped at
+    once with index arithmetic instead of one cell at a time. Duplicates
+    are dropped without sorting: every candidate writes its position into
+    slot and only the one whose write survived is kept.
+    """
+    col = frontier % cols
+    candidates = np.concatenate((
+        frontier[frontier + cols < size] + cols,  # DOWN
+        frontier[frontier >= cols] - cols,  # UP
+        frontier[col < cols - 1] + 1,  # RIGHT
+        frontier[col > 0] - 1,  # LEFT
+    ))
+    candidates = candidates[unvisited[candidates]]
+    positions = np.arange(candidates.size)
+    slot[candidates] = positions
+    candidates = candidates[slot[candidates] == positions]
+    unvisited[candidates] = False
+    return candidates
+
+
+def _wavefront(grid, source, target=None, observer=NULL_OBSERVER, stats=None):
+    if grid.connectivity != 4:
+        raise ValueError("The wavefront BFS only supports 4-connected grids")
+    stats = stats or SearchStats()
+    dist = np.full(grid.size, UNREACHED, dtype=np.int32)
+    unvisited = np.frombuffer(grid.cells, dtype=np.uint8) == 0
+    unvisited[source] = False
+    dist[source] = 0
+    slot = np.empty(grid.size, dtype=np.intp)
+    frontier = np.array([source], dtype=np.intp)
+    level = 0
+    stats.pushes = 1
+    stats.lap("setup")
+
+    while frontier.size and (target is None or dist[target] == UNREACHED):
+        if observer is not NULL_OBSERVER:
+            for index in frontier.tolist():
+                observer.on_close(index)
+        stats.expanded += frontier.size
+        level += 1
+        frontier = _advance(frontier, unvisited, slot, grid.cols, grid.size)
+        dist[frontier] = level
+        stats.pushes += frontier.size
+        if frontier.size > stats.peak_open:
+            stats.peak_open = frontier.size
+        if observer is not NULL_OBSERVER:
+            for index in frontier.tolist():
+                observer.on_open(index)
+
+    return dist
+
+
+def distance_field(grid, source):
+    """Exact 4-connected step distance from source to every cell.
+
+    Returns a (rows, cols) int32 array holding -1 for barriers and cells
+    that cannot be reached. Since moves are symmetric, passing the goal as
+    source gives the distance-to-goal map.
+    """
+    dist = _wavefront(grid, grid.index(source))
+    return dist.reshape(grid.rows, grid.cols)
+
+
+def wavefront_bfs_algorithm(grid, start, end, observer=NULL_OBSERVER):
+    """Breadth-first search that advances the whole frontier per step.
+
+    Same path lengths and costs as bfs.bfs_algorithm, though on ties it
+    may pick a different shortest path. The path is read back by walking
+    down the distance field from end, so no parent array is kept.
+    """
+    stats = SearchStats()
+    if not connected(grid, start, end):
+        return no_path(stats)
+    dist = _wavefront(grid, start, end, observer, stats)
+    if dist[end] == UNREACHED:
+        return no_path(stats)
+
+    stats.lap("search")
+
+    path = [end]
+    current = end
+    while current != start:
+        level = dist[current] - 1
+        current = next(n for n in grid.neighbors(current) if dist[n] == level)
+        path.append(current)
+    path.reverse()
+    cost = path_cost(grid, path)
+    path = [grid.pos(index) for index in path]
+    stats.lap("path")
+    return SearchResult(path, cost, stats)
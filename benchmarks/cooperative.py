@@ -0,0 +1,92 @@
+"""Throughput of cooperative pathfinding, in agents planned per second.
+
+Run from the repository root:
+
+    python benchmarks/cooperative.py --agents 10 50 --windows 0 8 16
+
+Every generated map gets agents with distinct random starts and goals
+that can reach each other. Window 0 is cooperative A*, planning every
+agent once; any other window runs windowed HCA* until all agents arrive.
+The table reports agents per second, how many agents arrived, the
+cells expanded per agent and the latest arrival tick (makespan). It
+checks that no two agents ever share a cell or swap places, and that no
+goal's flow field was evicted and rebuilt, and exits with status 1 if
+either happened. The default 50 agents have more goals than the 16
+fields a grid keeps by default.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.components import connected
+from algorithms.cooperative import cooperative_paths
+from algorithms.core import INF
+from algorithms.flowfield import flow_fields
+from benchmarks.mapgen import FAMILIES, generate
+
+
+def make_agents(grid, count, rng):
+    free = [index for index in range(grid.size) if not grid.cells[index]]
+    count = min(count, len(free) // 2)
+    while True:
+        cells = rng.sample(free, 2 * count)
+        pairs = list(zip(cells[:count], cells[count:]))
+        if all(connected(grid, start, goal) for start, goal in pairs):
+            return [(grid.pos(start), grid.pos(goal)) for start, goal in pairs]
+
+
+def collisions(agents, results):
+    """Number of ticks at which two agents share a cell or swap places"""
+    trails = [result.path or [start] for result, (start, _) in zip(results, agents)]
+    count = 0
+    for tick in range(max(len(trail) for trail in trails)):
+        now = [trail[min(tick, len(trail) - 1)] for trail in trails]
+        before = [trail[min(tick - 1, len(trail) - 1)] for trail in trails] if tick else now
+        moves = {(a, b) for a, b in zip(before, now) if a != b}
+        if len(set(now)) < len(now) or any((b, a) in moves for a, b in moves):
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--families", nargs="+", default=sorted(FAMILIES), choices=sorted(FAMILIES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 64], help="square map sides")
+    parser.add_argument("--agents", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--windows", type=int, nargs="+", default=[0, 16], help="0 for cooperative A*")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{'map':<16}{'agents':>7}{'window':>8}{'agents/s':>10}{'arrived':>9}{'expanded':>10}{'makespan':>10}"
+          f"{'collisions':>12}{'evictions':>11}")
+    failed = False
+    for family in args.families:
+        for size in args.sizes:
+            for count in args.agents:
+                # A fresh grid per agent set, so fields of earlier goals are not evicted
+                grid, _, _ = generate(family, size, size, args.seed)
+                agents = make_agents(grid, count, rng)
+                for window in args.windows:
+                    evictions = flow_fields(grid).evictions
+                    begin = time.perf_counter()
+                    results = cooperative_paths(grid, agents, window=window or None)
+                    seconds = time.perf_counter() - begin
+                    evictions = flow_fields(grid).evictions - evictions
+                    crashes = collisions(agents, results)
+                    failed = failed or crashes > 0 or evictions > 0
+                    arrived = [result for result in results if result.cost != INF]
+                    expanded = sum(result.expanded for result in results) // len(results)
+                    makespan = max((len(result.path) - 1 for result in arrived), default=0)
+                    print(f"{f'{family}-{size}':<16}{len(agents):>7}{window or '-':>8}{len(agents) / seconds:>10.1f}"
+                          f"{len(arrived):>9}{expanded:>10}{makespan:>10}{crashes:>12}{evictions:>11}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Many agents sharing one goal: A* per agent against one flow field.
+
+Run from the repository root:
+
+    python benchmarks/flow_fields.py --agents 100 500 --sizes 64 128
+
+For every generated map, the agents start on random free cells that can
+reach the goal. The first table compares one A* query per agent with
+building the goal's flow field once and walking every agent along it.
+The second compares repairing that field after a few barrier edits with
+building it again from scratch.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.astar import astar_algorithm
+from algorithms.components import connected
+from algorithms.flowfield import FlowField
+from benchmarks.mapgen import FAMILIES, generate
+
+
+def agents_for(grid, goal, count, rng):
+    free = [index for index in range(grid.size) if not grid.cells[index] and connected(grid, index, goal)]
+    return [rng.choice(free) for _ in range(count)] if free else []
+
+
+def per_agent_astar(grid, starts, goal):
+    begin = time.perf_counter()
+    expanded = sum(astar_algorithm(grid, start, goal).expanded for start in starts)
+    return time.perf_counter() - begin, expanded
+
+
+def shared_field(grid, starts, goal):
+    begin = time.perf_counter()
+    field = FlowField(grid, goal)
+    steps = sum(len(field.path(start)) for start in starts)
+    seconds = time.perf_counter() - begin
+    field.detach()
+    return seconds, field.stats.expanded, steps
+
+
+def repair_vs_rebuild(grid, goal, edits, rng):
+    field = FlowField(grid, goal)
+    cells = [index for index in range(grid.size) if index != goal]
+    for index in rng.sample(cells, min(edits, len(cells))):
+        grid.set_barrier(index, not grid.cells[index])
+    before = field.stats.expanded
+    begin = time.perf_counter()
+    field.update()
+    repair = time.perf_counter() - begin
+    field.detach()
+    begin = time.perf_counter()
+    FlowField(grid, goal).detach()
+    rebuild = time.perf_counter() - begin
+    return repair, field.stats.expanded - before, rebuild
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--families", nargs="+", default=sorted(FAMILIES), choices=sorted(FAMILIES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 128], help="square map sides")
+    parser.add_argument("--agents", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--edits", type=int, default=5, help="barrier toggles before a repair")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{'map':<16}{'agents':>7}{'astar ms':>11}{'expanded':>10}{'field ms':>11}{'expanded':>10}"
+          f"{'speedup':>9}")
+    repairs = []
+    for family in args.families:
+        for size in args.sizes:
+            grid, _, end = generate(family, size, size, args.seed)
+            goal = grid.index(end)
+            name = f"{family}-{size}"
+            for count in args.agents:
+                starts = agents_for(grid, goal, count, rng)
+                if not starts:
+                    continue
+                astar_seconds, astar_expanded = per_agent_astar(grid, starts, goal)
+                field_seconds, field_expanded, _ = shared_field(grid, starts, goal)
+                print(f"{name:<16}{count:>7}{astar_seconds * 1000:>11.2f}{astar_expanded:>10}"
+                      f"{field_seconds * 1000:>11.2f}{field_expanded:>10}{astar_seconds / field_seconds:>8.1f}x")
+            repairs.append((name, *repair_vs_rebuild(grid, goal, args.edits, rng)))
+
+    print()
+    print(f"{'map':<16}{'repair ms':>11}{'expanded':>10}{'rebuild ms':>12}")
+    for name, repair, expanded, rebuild in repairs:
+        print(f"{name:<16}{repair * 1000:>11.2f}{expanded:>10}{rebuild * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
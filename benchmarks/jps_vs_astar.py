@@ -0,0 +1,70 @@
+"""Compare Jump Point Search with A* on the maps in maps/.
+
+Run from the repository root:
+
+    python benchmarks/jps_vs_astar.py --scale 1 4 16
+
+--scale blows every map cell up into an N x N block, which turns the
+small hand-drawn maps into large open rooms where JPS pays off most.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.astar import astar_algorithm
+from algorithms.grid import Grid
+from algorithms.jps import jps_algorithm
+from algorithms.maps import load_text_map
+
+
+def scale_map(grid, start, end, factor):
+    big = Grid(grid.rows * factor, grid.cols * factor)
+    for index in range(grid.size):
+        if grid.cells[index]:
+            row, col = grid.pos(index)
+            for r in range(row * factor, (row + 1) * factor):
+                for c in range(col * factor, (col + 1) * factor):
+                    big.set_barrier(big.index((r, c)))
+    return big, (start[0] * factor, start[1] * factor), (end[0] * factor, end[1] * factor)
+
+
+def measure(search, grid, start, end, repeat, **options):
+    best = float("inf")
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        result = search(grid, grid.index(start), grid.index(end), **options)
+        best = min(best, time.perf_counter() - begin)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--maps", default="maps", help="directory of .txt maps")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per query, best time is kept")
+    args = parser.parse_args()
+
+    print(f"{'map':<16}{'size':>10}  {'algorithm':<10}{'cost':>9}{'expanded':>10}{'ms':>10}")
+    for path in sorted(glob.glob(os.path.join(args.maps, "*.txt"))):
+        grid, start, end = load_text_map(path)
+        if start is None or end is None:
+            continue
+        for factor in args.scale:
+            big, s, e = scale_map(grid, start, end, factor)
+            runs = [
+                ("astar", astar_algorithm, {}),
+                ("jps", jps_algorithm, {}),
+                ("jps-8", jps_algorithm, {"diagonal": True}),
+            ]
+            for name, search, options in runs:
+                result, seconds = measure(search, big, s, e, args.repeat, **options)
+                print(f"{os.path.basename(path):<16}{f'{big.rows}x{big.cols}':>10}  {name:<10}"
+                      f"{result.cost:>9.6g}{result.expanded:>10}{seconds * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
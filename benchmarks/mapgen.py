@@ -0,0 +1,124 @@
+"""Seeded map generators for the benchmarks.
+
+Every family is a function (rows, cols, rng) -> cells bytearray, or a
+(cells, costs) pair for weighted terrain, and generate() wraps it into a
+Grid with a start near the top-left corner and an end near the
+bottom-right one. The same family, size and seed always give the same
+map.
+"""
+import random
+
+from algorithms.grid import Grid
+
+
+def open_field(rows, cols, rng):
+    return bytearray(rows * cols)
+
+
+def noise(rows, cols, rng, density=0.25):
+    return bytearray(1 if rng.random() < density else 0 for _ in range(rows * cols))
+
+
+def maze(rows, cols, rng):
+    # Iterative recursive backtracker carving passages between odd cells
+    cells = bytearray(b"\1" * (rows * cols))
+    start = (1, 1)
+    cells[cols + 1] = 0
+    stack = [start]
+    while stack:
+        row, col = stack[-1]
+        options = [
+            (row + dr, col + dc, row + dr // 2, col + dc // 2)
+            for dr, dc in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 < row + dr < rows - 1 and 0 < col + dc < cols - 1 and cells[(row + dr) * cols + col + dc]
+        ]
+        if not options:
+            stack.pop()
+            continue
+        r, c, wall_r, wall_c = rng.choice(options)
+        cells[wall_r * cols + wall_c] = 0
+        cells[r * cols + c] = 0
+        stack.append((r, c))
+    return cells
+
+
+def rooms(rows, cols, rng, attempts=None):
+    # Non-overlapping rectangular rooms joined in order by L-shaped corridors
+    cells = bytearray(b"\1" * (rows * cols))
+
+    def carve(r0, c0, r1, c1):
+        for r in range(min(r0, r1), max(r0, r1) + 1):
+            start = r * cols
+            cells[start + min(c0, c1):start + max(c0, c1) + 1] = bytes(abs(c1 - c0) + 1)
+
+    centers = []
+    placed = []
+    for _ in range(attempts or max(4, rows * cols // 100)):
+        height = rng.randint(3, max(3, rows // 5))
+        width = rng.randint(3, max(3, cols // 5))
+        top = rng.randint(1, max(1, rows - height - 1))
+        left = rng.randint(1, max(1, cols - width - 1))
+        bottom, right = min(top + height, rows - 1) - 1, min(left + width, cols - 1) - 1
+        if any(top <= b + 1 and t <= bottom + 1 and left <= r + 1 and l <= right + 1 for t, l, b, r in placed):
+            continue
+        placed.append((top, left, bottom, right))
+        carve(top, left, bottom, right)
+        centers.append(((top + bottom) // 2, (left + right) // 2))
+    centers.sort()
+    for (r0, c0), (r1, c1) in zip(centers, centers[1:]):
+        carve(r0, c0, r0, c1)
+        carve(r0, c1, r1, c1)
+    return cells
+
+
+def terrain(rows, cols, rng):
+    # Grass (2) with patches of mud (5) and water (9), crossed by roads (1)
+    # and dotted with a few rocks
+    cells = bytearray(1 if rng.random() < 0.05 else 0 for _ in range(rows * cols))
+    costs = bytearray(b"\2" * (rows * cols))
+    for cost in (5, 9):
+        for _ in range(max(1, rows * cols // 400)):
+            top, left = rng.randrange(rows), rng.randrange(cols)
+            bottom = min(rows, top + rng.randint(2, max(2, rows // 6)))
+            right = min(cols, left + rng.randint(2, max(2, cols // 6)))
+            for r in range(top, bottom):
+                costs[r * cols + left:r * cols + right] = bytes([cost]) * (right - left)
+    for _ in range(max(1, rows // 16)):
+        row = rng.randrange(rows)
+        costs[row * cols:(row + 1) * cols] = b"\1" * cols
+        cells[row * cols:(row + 1) * cols] = bytes(cols)
+    for _ in range(max(1, cols // 16)):
+        col = rng.randrange(cols)
+        costs[col::cols] = b"\1" * rows
+        cells[col::cols] = bytes(rows)
+    return cells, costs
+
+
+FAMILIES = {
+    "open": open_field,
+    "noise": noise,
+    "maze": maze,
+    "rooms": rooms,
+    "terrain": terrain,
+}
+
+
+def _nearest_free(grid, row, col):
+    # Free cell closest to (row, col) by Chebyshev rings, or None on a full grid
+    for radius in range(max(grid.rows, grid.cols)):
+        for r in range(row - radius, row + radius + 1):
+            for c in range(col - radius, col + radius + 1):
+                if grid.in_bounds((r, c)) and not grid.cells[grid.index((r, c))]:
+                    return r, c
+    return None
+
+
+def generate(family, rows, cols, seed=0, connectivity=4, corners="never"):
+    """Build one map of the given family; returns (grid, start, end) positions"""
+    rng = random.Random(f"{family}-{rows}x{cols}-{seed}")
+    planes = FAMILIES[family](rows, cols, rng)
+    cells, costs = planes if isinstance(planes, tuple) else (planes, None)
+    grid = Grid(rows, cols, cells, costs, connectivity, corners)
+    start = _nearest_free(grid, 1, 1)
+    end = _nearest_free(grid, rows - 2, cols - 2)
+    return grid, start, end
@@ -0,0 +1,123 @@
+"""Throughput of the open sets in algorithms/openset.py against queue.PriorityQueue.
+
+Run from the repository root:
+
+    python benchmarks/open_sets.py --operations 200000
+
+The first table replays one Dijkstra-like workload on every queue: each
+pop is followed by a few pushes at slightly higher integer priorities,
+some of them lowering the priority of a node that is already queued. The
+second table runs A* and UCS with each open set on generated maps.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from queue import PriorityQueue
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.openset import BucketQueue, HeapOpenSet, IndexedHeap
+from algorithms.search import find_path
+from benchmarks.mapgen import generate
+
+
+class LockedQueue:
+    """queue.PriorityQueue behind the open set interface, as the searches used it before"""
+
+    def __init__(self):
+        self.queue = PriorityQueue()
+        self.count = 0
+        self.queued = set()
+
+    def __len__(self):
+        return self.queue.qsize()
+
+    def __contains__(self, node):
+        return node in self.queued
+
+    def push(self, node, priority):
+        # No decrease-key: a better priority adds a duplicate entry
+        self.count += 1
+        self.queued.add(node)
+        self.queue.put((priority, self.count, node))
+
+    def pop(self):
+        node = self.queue.get()[2]
+        self.queued.discard(node)
+        return node
+
+
+QUEUES = {
+    "PriorityQueue": LockedQueue,
+    "HeapOpenSet": HeapOpenSet,
+    "IndexedHeap": IndexedHeap,
+    "BucketQueue": BucketQueue,
+}
+
+
+def workload(operations, nodes, seed=0):
+    """List of ('push', node, priority) and ('pop',) steps with monotone priorities"""
+    rng = random.Random(seed)
+    reference = HeapOpenSet()
+    priority = {}  # queued node -> priority
+    floor = 0
+    steps = []
+    while len(steps) < operations:
+        if priority and rng.random() < 0.4:
+            node = reference.pop()
+            floor = priority.pop(node)
+            steps.append(("pop",))
+            continue
+        node = rng.randrange(nodes)
+        value = floor + rng.randrange(1, 8)
+        if priority.get(node, value + 1) <= value:
+            continue
+        priority[node] = value
+        reference.push(node, value)
+        steps.append(("push", node, value))
+    return steps
+
+
+def replay(queue, steps):
+    begin = time.perf_counter()
+    for step in steps:
+        if step[0] == "pop":
+            queue.pop()
+        else:
+            queue.push(step[1], step[2])
+    return time.perf_counter() - begin
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=200000)
+    parser.add_argument("--size", type=int, default=128, help="side of the generated maps")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Priorities only grow past what was popped, so every queue, including
+    # the monotone BucketQueue, accepts the same steps.
+    steps = workload(args.operations, args.operations // 4)
+    print(f"{'open set':<16}{'ops/s':>12}")
+    for name, queue in QUEUES.items():
+        seconds = min(replay(queue(), steps) for _ in range(args.repeat))
+        print(f"{name:<16}{len(steps) / seconds:>12,.0f}")
+
+    print()
+    print(f"{'map':<16}{'algorithm':<10}{'open set':<16}{'expanded':>10}{'ms':>10}")
+    for family in ("open", "rooms", "maze"):
+        grid, start, end = generate(family, args.size, args.size)
+        for algorithm in ("astar", "ucs"):
+            for name, queue in QUEUES.items():
+                best = float("inf")
+                for _ in range(args.repeat):
+                    begin = time.perf_counter()
+                    result = find_path(grid, start, end, algorithm, queue=queue)
+                    best = min(best, time.perf_counter() - begin)
+                print(f"{family:<16}{algorithm:<10}{name:<16}{result.expanded:>10}{best * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""Headless benchmark suite over every search algorithm and generated maps.
+
+Run from the repository root:
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json
+
+Each algorithm runs on seeded maps from benchmarks/mapgen.py. The suite
+records the best wall time of --repeat runs, the nodes expanded, the peak
+memory allocated during one extra traced run, and how the path cost
+compares with the optimal cost found by UCS. SMA* also runs once under a
+max_bytes budget, and the suite fails if its traced peak goes over, or
+if it cannot get through a barrier detour with room for just the path.
+Results are written as JSON.
+With --baseline, every result is compared with the matching entry of an
+earlier output and the exit status is 1 if anything regressed. Right
+before every timed run the suite also times a fixed BFS, and baseline
+times are scaled by how much slower or faster that reference ran, so the
+comparison stays fair on another machine and on one whose speed drifts
+while the suite runs. A query that still looks slower is timed again, and
+only reported if it stays slower.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.components import components_for
+from algorithms.core import INF
+from algorithms.grid import CORNER_POLICIES, Grid
+from algorithms.search import ALGORITHMS, find_path
+from algorithms.smastar import BASE_BYTES, NODE_BYTES, step_counts
+from benchmarks.mapgen import FAMILIES, generate
+
+DEFAULT_ALGORITHMS = ["ucs", "dfs", "bfs", "astar", "bidirectional", "bidirectional_astar", "iddfs", "idastar", "smastar", "beam", "greedy_bfs"]
+
+# The deepening searches still redo part of their work every iteration
+# and are skipped on maps with more cells than this; see --limit.
+SIZE_LIMITS = {"iddfs": 32 * 32, "idastar": 64 * 64}
+
+# Timings below this many seconds are too noisy to call a regression
+TIME_FLOOR = 0.002
+
+# Map of the BFS query timed next to every run
+REFERENCE = ("open", 64, 64)
+
+# Times a query that looks slower than its baseline is timed again
+RETIMES = 2
+
+# SMA*'s byte budget holds this share of the nodes its uncapped run held,
+# so it has to forget some, but at least twice the path's cells, so that
+# it does not spend the run regenerating subtrees
+BUDGET_SHARE = 0.75
+
+# SMA* gets this many expansions to cross the detour map with room for the
+# path alone; it needs 158
+DETOUR_EXPANSIONS = 1000
+
+
+def fresh(grid):
+    # A private copy, so structures cached on the grid never carry over between
+    # runs. The component index is the exception: every search consults it, and
+    # a long-lived grid keeps it current across edits, so it is built up front.
+    costs = None if grid.costs is None else bytearray(grid.costs)
+    copy = Grid(grid.rows, grid.cols, bytearray(grid.cells), costs, grid.connectivity, grid.corners)
+    components_for(copy).connected(0, 0)
+    return copy
+
+
+def valid_path(grid, path, start, end):
+    if not path:
+        return True
+    if path[0] != start or path[-1] != end:
+        return False
+    indices = [grid.index(pos) for pos in path]
+    return all(b in grid.neighbors(a) for a, b in zip(indices, indices[1:])) and not grid.cells[indices[0]]
+
+
+def run(grid, start, end, algorithm, repeat, reference):
+    """Result, best time, best time of the reference BFS and traced peak of algorithm"""
+    best = best_reference = INF
+    for _ in range(repeat):
+        copy = fresh(grid)
+        # Like timeit, keep garbage collection pauses out of the timed runs
+        gc.collect()
+        gc.disable()
+        try:
+            # The reference query runs right before each timed run, so that
+            # both see the machine at the same speed
+            begin = time.perf_counter()
+            find_path(*reference, "bfs")
+            middle = time.perf_counter()
+            result = find_path(copy, start, end, algorithm)
+            best = min(best, time.perf_counter() - middle)
+            best_reference = min(best_reference, middle - begin)
+        finally:
+            gc.enable()
+
+    copy = fresh(grid)
+    tracemalloc.start()
+    try:
+        find_path(copy, start, end, algorithm)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, best, best_reference, peak
+
+
+def smastar_budget(grid, start, end, result):
+    """max_bytes below what the uncapped result needed, and the traced peak of SMA* under it"""
+    nodes = max(int(result.stats.peak_open * BUDGET_SHARE), 2 * len(result.path))
+    budget = BASE_BYTES + NODE_BYTES * nodes
+    copy = fresh(grid)
+    # The budget covers the search, not the move masks and step counts the
+    # grid builds on first use
+    copy.rebuild_masks()
+    step_counts(copy, copy.index(end))
+    tracemalloc.start()
+    try:
+        find_path(copy, start, end, "smastar", max_bytes=budget)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return budget, peak
+
+
+def smastar_detour():
+    """Human readable list of failures of SMA* around a wall with one gap.
+
+    The wall runs along the middle row of a 9x30 grid, open only over its
+    last four columns, so the shortest path between the two left corners
+    takes 61 cells, 57 more than a straight run. With max_nodes at 61 the
+    search must find it, and below that give up without expanding.
+    """
+    grid = Grid(9, 30)
+    for col in range(26):
+        grid.set_barrier(grid.index((4, col)))
+    start, end = (0, 0), (8, 0)
+    failures = []
+    result = find_path(grid, start, end, "smastar", max_nodes=61, max_expansions=DETOUR_EXPANSIONS)
+    if result.cost != 60:
+        failures.append(f"max_nodes 61: cost {result.cost} after {result.expanded} expansions, expected 60")
+    result = find_path(grid, start, end, "smastar", max_nodes=58)
+    if result.found or result.expanded:
+        failures.append(f"max_nodes 58: cost {result.cost} after {result.expanded} expansions, expected no path")
+    return failures
+
+
+def benchmark(args):
+    results = []
+    reference = generate(*REFERENCE)
+    for family in args.families:
+        for size in args.sizes:
+            for seed in range(args.seeds):
+                grid, start, end = generate(family, size, size, seed, args.connectivity, args.corners)
+                optimal = find_path(fresh(grid), start, end, "ucs").cost
+                for algorithm in args.algorithms:
+                    entry = {"family": family, "rows": size, "cols": size, "seed": seed, "algorithm": algorithm}
+                    if args.connectivity == 8:
+                        entry["connectivity"] = 8
+                    if grid.size > args.limits.get(algorithm, grid.size):
+                        entry["skipped"] = f"more than {args.limits[algorithm]} cells"
+                        results.append(entry)
+                        continue
+                    try:
+                        result, seconds, reference_seconds, peak = run(grid, start, end, algorithm, args.repeat, reference)
+                    except RecursionError:
+                        entry["error"] = "RecursionError"
+                        results.append(entry)
+                        report(entry)
+                        continue
+                    except ValueError as error:
+                        # Algorithms limited to 4-connected or uniform-cost grids refuse the others
+                        entry["skipped"] = str(error)
+                        results.append(entry)
+                        continue
+                    entry.update({
+                        "found": result.found,
+                        "valid": valid_path(grid, result.path, start, end),
+                        "cost": result.cost if result.found else None,
+                        "optimal_cost": optimal if optimal != INF else None,
+                        # 1.0 is optimal; a missing path when one exists counts as None
+                        "optimality": (result.cost / optimal if optimal else 1.0) if result.found else
+                                      (1.0 if optimal == INF else None),
+                        "expanded": result.expanded,
+                        "pushes": result.stats.pushes,
+                        "reopens": result.stats.reopens,
+                        "peak_open": result.stats.peak_open,
+                        "seconds": seconds,
+                        "reference_seconds": reference_seconds,
+                        "peak_bytes": peak,
+                    })
+                    if algorithm == "smastar" and result.found:
+                        entry["budget_bytes"], entry["budget_peak_bytes"] = smastar_budget(grid, start, end, result)
+                    results.append(entry)
+                    report(entry)
+    return results
+
+
+def report(entry):
+    name = f"{entry['family']}-{entry['rows']}x{entry['cols']}#{entry['seed']}"
+    if "error" in entry:
+        print(f"{name:<20}{entry['algorithm']:<15}{entry['error']}", file=sys.stderr)
+        return
+    optimality = "-" if entry["optimality"] is None else f"{entry['optimality']:.3f}"
+    print(f"{name:<20}{entry['algorithm']:<15}{optimality:>8}{entry['expanded']:>10}"
+          f"{entry['seconds'] * 1000:>10.2f}{entry['peak_bytes'] // 1024:>9}", file=sys.stderr)
+
+
+def key(entry):
+    return entry["family"], entry["rows"], entry["cols"], entry["seed"], entry["algorithm"], entry.get("connectivity", 4)
+
+
+def too_slow(entry, old, tolerance):
+    """The baseline time of old, scaled by the reference times, if entry took too much longer, else None"""
+    seconds = old["seconds"]
+    if "reference_seconds" in old:
+        seconds *= entry["reference_seconds"] / old["reference_seconds"]
+    if entry["seconds"] > seconds * (1 + tolerance) and entry["seconds"] - seconds > TIME_FLOOR:
+        return seconds
+    return None
+
+
+def retime(results, baseline, args):
+    """Time again the results too slow against baseline, keeping each faster run.
+
+    The machine can change speed in the middle of a timed run, after the
+    reference ran; a real slowdown shows up again, and a passing one does not.
+    """
+    before = {key(entry): entry for entry in baseline}
+    reference = generate(*REFERENCE)
+    for entry in results:
+        old = before.get(key(entry))
+        if old is None or "seconds" not in entry or "seconds" not in old:
+            continue
+        for _ in range(RETIMES):
+            if too_slow(entry, old, args.tolerance) is None:
+                break
+            grid, start, end = generate(entry["family"], entry["rows"], entry["cols"], entry["seed"],
+                                        args.connectivity, args.corners)
+            _, seconds, reference_seconds, _ = run(grid, start, end, entry["algorithm"], args.repeat, reference)
+            if seconds / reference_seconds < entry["seconds"] / entry["reference_seconds"]:
+                entry["seconds"], entry["reference_seconds"] = seconds, reference_seconds
+
+
+def compare(results, baseline, tolerance):
+    """List of human readable regressions of results against baseline results.
+
+    Baseline times are multiplied by the ratio of the two reference times
+    taken next to them, when both results have one.
+    """
+    before = {key(entry): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        old = before.get(key(entry))
+        if old is None or "skipped" in entry or "skipped" in old:
+            continue
+        name = "{}-{}x{}#{} {} ({}-connected)".format(*key(entry))
+        if "error" in entry:
+            if "error" not in old:
+                regressions.append(f"{name}: {entry['error']}")
+            continue
+        if "error" in old:
+            continue
+        if not entry["valid"]:
+            regressions.append(f"{name}: invalid path")
+        if old["found"] and not entry["found"]:
+            regressions.append(f"{name}: no longer finds a path")
+        if entry["optimality"] is not None and old["optimality"] is not None \
+                and entry["optimality"] > old["optimality"] + 1e-9:
+            regressions.append(f"{name}: optimality {old['optimality']:.3f} -> {entry['optimality']:.3f}")
+        if entry["expanded"] > old["expanded"]:
+            regressions.append(f"{name}: expanded {old['expanded']} -> {entry['expanded']}")
+        seconds = too_slow(entry, old, tolerance)
+        if seconds is not None:
+            regressions.append(f"{name}: time {seconds * 1000:.2f} ms -> {entry['seconds'] * 1000:.2f} ms")
+        if entry["peak_bytes"] > old["peak_bytes"] * (1 + tolerance):
+            regressions.append(f"{name}: peak memory {old['peak_bytes']} -> {entry['peak_bytes']} bytes")
+    return regressions
+
+
+def over_budget(results):
+    """Human readable list of runs whose traced peak went over their max_bytes"""
+    return ["{}-{}x{}#{} {} ({}-connected): peak {} bytes over the budget of {}".format(
+                *key(entry), entry["budget_peak_bytes"], entry["budget_bytes"])
+            for entry in results if entry.get("budget_peak_bytes", 0) > entry.get("budget_bytes", INF)]
+
+
+def parse_limit(text):
+    name, _, cells = text.partition("=")
+    return name, int(cells)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS, choices=sorted(ALGORITHMS))
+    parser.add_argument("--families", nargs="+", default=sorted(FAMILIES), choices=sorted(FAMILIES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 64, 128], help="square map sides")
+    parser.add_argument("--seeds", type=int, default=2, help="maps per family and size")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per query, best time is kept")
+    parser.add_argument("--connectivity", type=int, default=4, choices=(4, 8))
+    parser.add_argument("--corners", default="never", choices=CORNER_POLICIES, help="corner cutting on 8-connected maps")
+    parser.add_argument("--limit", type=parse_limit, action="append", default=[], metavar="ALGORITHM=CELLS",
+                        help="skip an algorithm on larger maps (0 removes a default limit)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON output of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed relative growth of time and peak memory over the baseline")
+    args = parser.parse_args()
+    args.limits = dict(SIZE_LIMITS)
+    for name, cells in args.limit:
+        if cells:
+            args.limits[name] = cells
+        else:
+            args.limits.pop(name, None)
+
+    print(f"{'map':<20}{'algorithm':<15}{'optimal':>8}{'expanded':>10}{'ms':>10}{'peak KiB':>9}", file=sys.stderr)
+    results = benchmark(args)
+    if args.output:
+        header = {"python": platform.python_version(), "platform": platform.platform(), "repeat": args.repeat}
+        # One result per line keeps diffs between stored runs readable
+        with open(args.output, "w") as file:
+            file.write(json.dumps(header)[:-1] + ', "results": [\n')
+            file.write(",\n".join(json.dumps(entry) for entry in results))
+            file.write("\n]}\n")
+
+    overruns = over_budget(results)
+    for line in overruns:
+        print(f"OVER BUDGET {line}")
+    detours = smastar_detour() if "smastar" in args.algorithms else []
+    for line in detours:
+        print(f"SMA* DETOUR {line}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        retime(results, baseline["results"], args)
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions or overruns or detours:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+    if overruns or detours:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
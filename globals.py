@@ -1,4 +0,0 @@
-state = {
-    "number_of_node_explored": 0,
-    "total_cost": 0
-}
@@ -1,18 +1,23 @@
+import argparse
+from functools import partial
 import pygame
 import math
 from queue import PriorityQueue
-from algorithms import astar, dfs, bfs, ucs, bi_direction_search, iddfs, idastar, beamsearch, greedy_bfs 
+from algorithms import arastar, astar, dfs, bfs, ucs, bi_direction_search, bidirectional_astar, iddfs, idastar, beamsearch, greedy_bfs, jps, hpa, dstar_lite, smastar, flowfield, visualize, maps
+from algorithms.grid import CORNER_POLICIES, Grid
   
-import globals 
 
 pygame.init()
 
 WIDTH = 800
 HEIGHT = 500
-INSTRUCTION_HEIGHT = 270  # Space for instructions
+INSTRUCTION_HEIGHT = 390  # Space for instructions
 WIN = pygame.display.set_mode((WIDTH, HEIGHT + INSTRUCTION_HEIGHT))
 pygame.display.set_caption("Path Finding Visualizer")
 
+FPS = 60  # Repaint cap
+STEPS_PER_FRAME = 4  # Search steps replayed between two frames
+
 
 
 RED = (255, 0, 0)
@@ -27,15 +32,24 @@ GREY = (128, 128, 128)
 TURQUOISE = (64, 224, 208)
 
 class Spot:
-	def __init__(self, row, col, width, total_rows):
+	"""GUI view of one cell of the shared Grid model.
+
+	Barrier state lives in the model's bytearray; the Spot only adds the
+	pixel geometry and the display color. Color changes are appended to
+	the shared changed list, so the Renderer only repaints those cells.
+	"""
+	__slots__ = ("model", "index", "row", "col", "x", "y", "width", "color", "changed")
+
+	def __init__(self, model, row, col, width, changed):
+		self.model = model
+		self.index = model.index((row, col))
 		self.row = row
 		self.col = col
 		self.x = row * width
 		self.y = col * width
-		self.color = WHITE
-		self.neighbors = []
 		self.width = width
-		self.total_rows = total_rows
+		self.color = WHITE
+		self.changed = changed
 
 	def get_pos(self):
 		return self.row, self.col
@@ -47,7 +61,7 @@ class Spot:
 		return self.color == GREEN
 
 	def is_barrier(self):
-		return self.color == BLACK
+		return self.model.cells[self.index] == 1
 
 	def is_start(self):
 		return self.color == ORANGE
@@ -55,55 +69,49 @@ class Spot:
 	def is_end(self):
 		return self.color == TURQUOISE
 
+	def set_color(self, color):
+		if color != self.color:
+			self.color = color
+			self.changed.append(self)
+
 	def reset(self):
-		self.color = WHITE
+		self.model.set_barrier(self.index, False)
+		self.set_color(WHITE)
 
 	def make_start(self):
-		self.color = ORANGE
+		self.model.set_barrier(self.index, False)
+		self.set_color(ORANGE)
 
 	def make_closed(self):
-		self.color = RED
+		self.set_color(RED)
 
 	def make_open(self):
-		self.color = GREEN
+		self.set_color(GREEN)
 
 	def make_barrier(self):
-		self.color = BLACK
+		self.model.set_barrier(self.index)
+		self.set_color(BLACK)
 
 	def make_end(self):
-		self.color = TURQUOISE
+		self.model.set_barrier(self.index, False)
+		self.set_color(TURQUOISE)
 
 	def make_path(self):
-		self.color = PURPLE
+		self.set_color(PURPLE)
 
 	def draw(self, win):
 		pygame.draw.rect(win, self.color, (self.x, self.y, self.width, self.width))
 
-	def update_neighbors(self, grid):
-		self.neighbors = []
-		rows = len(grid)
-		cols = len(grid[0])
-		if self.row < rows - 1 and not grid[self.row + 1][self.col].is_barrier():  # DOWN
-			self.neighbors.append(grid[self.row + 1][self.col])
-		if self.row > 0 and not grid[self.row - 1][self.col].is_barrier():  # UP
-			self.neighbors.append(grid[self.row - 1][self.col])
-		if self.col < cols - 1 and not grid[self.row][self.col + 1].is_barrier():  # RIGHT
-			self.neighbors.append(grid[self.row][self.col + 1])
-		if self.col > 0 and not grid[self.row][self.col - 1].is_barrier():  # LEFT
-			self.neighbors.append(grid[self.row][self.col - 1])
-
-	def __lt__(self, other):
-		return False
-
 
-def make_grid(gap, width, height):
-    grid = []
+def make_grid(gap, width, height, changed, connectivity=4, corners="never"):
     rows = width // gap
     cols = height // gap
+    model = Grid(rows, cols, connectivity=connectivity, corners=corners)
+    grid = []
     for i in range(rows):
         grid.append([])
         for j in range(cols):
-            spot = Spot(i, j, gap, cols)
+            spot = Spot(model, i, j, gap, changed)
             grid[i].append(spot)
     return grid
 
@@ -112,8 +120,8 @@ def draw_grid(win, gap, width, height):
     cols = height // gap
     for i in range(cols):
         pygame.draw.line(win, GREY, (0, i * gap), (width, i * gap))
-        for j in range(rows):
-            pygame.draw.line(win, GREY, (j * gap, 0), (j * gap, height))
+    for j in range(rows):
+        pygame.draw.line(win, GREY, (j * gap, 0), (j * gap, height))
 
 def draw_instructions(win, HEIGHT):
     font = pygame.font.SysFont("consolas", 18)
@@ -126,8 +134,15 @@ def draw_instructions(win, HEIGHT):
         "Press 6: Iterative Deepening DFS",
         "Press 7: Greedy Best-First Search",
         "Press 8: Beam Search", 
+        "Press 9: Jump Point Search (JPS)",
+        "Press 0: Hierarchical A* (HPA*)",
+        "Press D: D* Lite (replans after edits)",
+        "Press B: Bidirectional A* (MM)",
+        "Press A: Anytime A* (ARA*)",
+        "Press M: Memory-bounded A* (SMA*)",
+        "Press F: Flow field (reused per goal)",
         "",
-        "SPACE: Pause/Resume     C: Clear",
+        "SPACE: Pause/Resume   C: Clear   +/-: Speed",
         "Left Click: Place start/end/barriers",
 		"Right Click: Remove start/end/barriers",  
     ]
@@ -136,16 +151,55 @@ def draw_instructions(win, HEIGHT):
         rendered = font.render(text, True, BLACK)
         win.blit(rendered, (10, HEIGHT + 10 + i * 20))
 
-def draw(win, grid, gap, width, height):
-    win.fill(WHITE)
-
-    for row in grid:
-        for spot in row:
-            spot.draw(win)
-
-    draw_grid(win, gap, width, height)
-    draw_instructions(win, height)
-    pygame.display.update()
+class Renderer:
+	"""Repaints only the Spots whose color changed since the last frame.
+
+	The grid lines and the instructions are drawn once onto their own
+	surfaces and blitted back over repainted cells. frame() waits as needed
+	so no more than fps frames are drawn per second.
+	"""
+
+	def __init__(self, win, gap, width, height, fps=FPS):
+		self.win = win
+		self.height = height
+		self.fps = fps
+		self.clock = pygame.time.Clock()
+		self.changed = []
+		self.grid = None
+		self.repaint_all = True
+
+		self.lines = pygame.Surface((width, height), pygame.SRCALPHA)
+		draw_grid(self.lines, gap, width, height)
+		self.instructions = pygame.Surface((width, INSTRUCTION_HEIGHT))
+		self.instructions.fill(WHITE)
+		draw_instructions(self.instructions, 0)
+
+	def show(self, grid):
+		"""Repaint everything on the next frame, from this Spot grid"""
+		self.grid = grid
+		self.repaint_all = True
+
+	def frame(self):
+		win = self.win
+		if self.repaint_all:
+			win.fill(WHITE)
+			for row in self.grid:
+				for spot in row:
+					spot.draw(win)
+			win.blit(self.lines, (0, 0))
+			win.blit(self.instructions, (0, self.height))
+			pygame.display.flip()
+			self.repaint_all = False
+		elif self.changed:
+			rects = []
+			for spot in set(self.changed):
+				rect = pygame.Rect(spot.x, spot.y, spot.width, spot.width)
+				spot.draw(win)
+				win.blit(self.lines, rect, rect)
+				rects.append(rect)
+			pygame.display.update(rects)
+		self.changed.clear()
+		self.clock.tick(self.fps)
 
 def get_clicked_pos(pos, gap):
 	y, x = pos
@@ -158,37 +212,44 @@ def get_clicked_pos(pos, gap):
 import os
 
 def load_map_from_file(filename, grid, gap):
-    try:
-        path = os.path.join("maps", filename)
-        with open(path, 'r') as file:
-            lines = file.readlines()
-            start = None
-            end = None
-            for i, line in enumerate(lines):
-                for j, char in enumerate(line.strip()):
-                    if i < len(grid) and j < len(grid[0]):
-                        spot = grid[j][i]
-                        if char == 'x':
-                            spot.make_barrier()
-                        elif char == 's':
-                            spot.make_start()
-                            start = spot
-                        elif char == 'e':
-                            spot.make_end()
-                            end = spot
-                        else:
-                            spot.reset()
-            return start, end
-    except Exception as e:
-        print(f"Lỗi khi tải bản đồ: {e}")
-        return None, None
-
-def main(win):
-	GAP = 20
+    """Load a text or binary map onto the Spot grid and return its start and end Spots.
+
+    filename is used as given if it exists, otherwise it is looked up in
+    maps/. A map larger than the window grid is rejected rather than clipped.
+    """
+    path = filename if os.path.exists(filename) else os.path.join("maps", filename)
+    model, start_pos, end_pos = maps.load_map(path)
+    rows = len(grid)
+    cols = len(grid[0])
+    if model.rows > rows or model.cols > cols:
+        raise ValueError(f"{path} is {model.rows}x{model.cols} cells, the window grid is only {rows}x{cols}")
+
+    for row in grid:
+        for spot in row:
+            r, c = spot.get_pos()
+            if r < model.rows and c < model.cols and model.cells[model.index((r, c))]:
+                spot.make_barrier()
+            else:
+                spot.reset()
+
+    start = None
+    end = None
+    if start_pos is not None:
+        start = grid[start_pos[0]][start_pos[1]]
+        start.make_start()
+    if end_pos is not None:
+        end = grid[end_pos[0]][end_pos[1]]
+        end.make_end()
+    return start, end
+
+def main(win, gap=20, fps=FPS, steps_per_frame=STEPS_PER_FRAME, connectivity=4, corners="never", beam_width=3):
+	GAP = gap
 	ROWS = WIDTH // GAP
 	COLS = HEIGHT // GAP
 
-	grid = make_grid(GAP, WIDTH, HEIGHT)
+	renderer = Renderer(win, GAP, WIDTH, HEIGHT, fps)
+	grid = make_grid(GAP, WIDTH, HEIGHT, renderer.changed, connectivity, corners)
+	renderer.show(grid)
 	start = None
 	end = None
 	algorithm = None
@@ -196,6 +257,7 @@ def main(win):
 
 	run = True
 	start_time = None
+	beam_search = partial(beamsearch.beam_search_algorithm, beam_width=beam_width)
 
 	algo_mapping = {
 		pygame.K_1: ucs.ucs_algorithm,
@@ -205,7 +267,9 @@ def main(win):
 		pygame.K_5: bi_direction_search.bi_directional_search_algorithm,
 		pygame.K_6: iddfs.iddfs_algorithm,
 		pygame.K_7: greedy_bfs.greedy_bfs_algorithm,
-		pygame.K_8: beamsearch.beam_search_algorithm,
+		pygame.K_8: beam_search,
+		pygame.K_9: jps.jps_algorithm,
+		pygame.K_0: hpa.hpa_algorithm,
 		pygame.K_KP_1: ucs.ucs_algorithm,
 		pygame.K_KP_2: dfs.dfs_algorithm,
 		pygame.K_KP_3: bfs.bfs_algorithm,
@@ -213,25 +277,40 @@ def main(win):
 		pygame.K_KP_5: bi_direction_search.bi_directional_search_algorithm,
 		pygame.K_KP_6: iddfs.iddfs_algorithm,
 		pygame.K_KP_7: greedy_bfs.greedy_bfs_algorithm,
-		pygame.K_KP_8: beamsearch.beam_search_algorithm,
+		pygame.K_KP_8: beam_search,
+		pygame.K_KP_9: jps.jps_algorithm,
+		pygame.K_KP_0: hpa.hpa_algorithm,
+		pygame.K_d: dstar_lite.dstar_lite_algorithm,
+		pygame.K_b: bidirectional_astar.bidirectional_astar_algorithm,
+		pygame.K_a: arastar.arastar_algorithm,
+		pygame.K_m: smastar.smastar_algorithm,
+		pygame.K_f: flowfield.flowfield_algorithm,
 	}
 
 	while run:
-		draw(win, grid, GAP, WIDTH, HEIGHT)
+		renderer.frame()
 
 		if algorithm and not paused:
 			try:
-				next(algorithm)
+				for _ in range(steps_per_frame):
+					next(algorithm)
 			except StopIteration:
 				algorithm = None
 				end_time = pygame.time.get_ticks()
 				total_time = end_time - start_time
 				print(f"Total time cost: {total_time} ms")
+			except ValueError as error:
+				# e.g. a 4-connected-only algorithm on a diagonal grid, or JPS on terrain
+				algorithm = None
+				print(error)
 
 		for event in pygame.event.get():
 			if event.type == pygame.QUIT:
 				run = False
 
+			if event.type == pygame.WINDOWEXPOSED:
+				renderer.show(grid)
+
 			if pygame.mouse.get_pressed()[0]:  # LEFT
 				pos = pygame.mouse.get_pos()
 				row, col = get_clicked_pos(pos, GAP)
@@ -263,27 +342,41 @@ def main(win):
 				key = event.key
 				print("Key name:", pygame.key.name(key))
 
-				# Start algorithm with 1–8 keys
+				# Start algorithm with 0–9 and D keys
 				if key in algo_mapping and start and end and not algorithm:
-					for row in grid:
-						for spot in row:
-							spot.update_neighbors(grid)
 					start_time = pygame.time.get_ticks()
-					algorithm = algo_mapping[key](lambda: draw(win, grid, GAP, WIDTH, HEIGHT), grid, start, end)
+					algorithm = visualize.animate(algo_mapping[key], grid, start, end)
 					paused = False
 
 				# Pause/resume
 				elif key == pygame.K_SPACE and algorithm:
 					paused = not paused
 
+				# Replay speed
+				elif key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+					steps_per_frame *= 2
+					print(f"Steps per frame: {steps_per_frame}")
+				elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+					steps_per_frame = max(1, steps_per_frame // 2)
+					print(f"Steps per frame: {steps_per_frame}")
+
 				# Clear grid
 				elif key == pygame.K_c:
 					start = None
 					end = None
-					grid = make_grid(GAP, WIDTH, HEIGHT)
+					grid = make_grid(GAP, WIDTH, HEIGHT, renderer.changed, connectivity, corners)
+					renderer.show(grid)
 					algorithm = None
 					paused = False
 
 	pygame.quit()
 
-main(WIN)
+parser = argparse.ArgumentParser(description="Path Finding Visualizer")
+parser.add_argument("--gap", type=int, default=20, help="cell size in pixels; 4 gives a 200x125 grid")
+parser.add_argument("--fps", type=int, default=FPS, help="repaint cap")
+parser.add_argument("--steps", type=int, default=STEPS_PER_FRAME, help="search steps per frame")
+parser.add_argument("--connectivity", type=int, default=4, choices=(4, 8), help="8 allows diagonal moves")
+parser.add_argument("--corners", default="never", choices=CORNER_POLICIES, help="when diagonal moves may cut a barrier corner")
+parser.add_argument("--beam-width", type=int, default=3, help="cells kept per level by beam search (key 8)")
+args = parser.parse_args()
+main(WIN, args.gap, args.fps, args.steps, args.connectivity, args.corners, args.beam_width)